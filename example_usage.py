@@ -45,17 +45,19 @@ def example_1_simple_appeal():
         'clean_record': True,
     }
 
-    # Generate comprehensive appeal
-    appeal = generator.generate_comprehensive_appeal(
+    print("Generated Appeal:")
+    print("-" * 70)
+
+    # Generate comprehensive appeal, printing it as it is written
+    for chunk in generator.stream_comprehensive_appeal(
         citation_details,
         {'state': location_info.get('state'), 'city': location_info.get('city')},
         angles,
         evidence
-    )
+    ):
+        print(chunk, end="", flush=True)
 
-    print("Generated Appeal:")
-    print("-" * 70)
-    print(appeal)
+    print()
     print("-" * 70)
 
 
@@ -10,6 +10,7 @@ import argparse
 from dotenv import load_dotenv
 
 from parking_appeal.workflow import AppealWorkflow
+from parking_appeal.regulations import RegulationDatabase
 
 
 def main():
@@ -51,6 +52,8 @@ Environment Variables:
 
     parser.add_argument(
         '--state',
+        type=str.upper,
+        choices=RegulationDatabase.get_all_states(),
         help='State code (for quick mode, e.g., CA, NY)'
     )
 
@@ -85,8 +88,7 @@ Environment Variables:
             print("QUICK APPEAL MODE")
             print("="*70 + "\n")
 
-            appeal = workflow.quick_appeal(args.citation, args.state, args.violation)
-            print(appeal)
+            workflow.quick_appeal(args.citation, args.state, args.violation, stream=True)
 
         else:
             # Interactive mode
@@ -2,23 +2,350 @@
 Core appeal generator using Google Gemini API.
 """
 
+import asyncio
+import hashlib
 import os
-from typing import Dict, List, Optional
-import google.generativeai as genai
-from .regulations import RegulationDatabase
+import threading
+import time
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional
+
+try:
+    import orjson as _json
+except ImportError:  # optional, faster parsing of structured responses
+    import json as _json
+try:
+    import diskcache
+except ImportError:  # optional, only needed for a persistent response cache
+    diskcache = None
+from .regulations import RegulationDatabase, STATE_REGULATIONS
 from .appeal_strategies import AppealStrategyAnalyzer, AppealAngle
 
+# Upper bound on Gemini requests in flight at once when fanning out angles.
+MAX_CONCURRENT_REQUESTS = 8
+
+# Rate-limit and server-side API errors are retried up to MAX_RETRIES times,
+# waiting RETRY_BASE_DELAY seconds before the first retry and doubling each time.
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+
+# Number of responses kept by the in-memory response cache.
+RESPONSE_CACHE_SIZE = 512
+
+# Upper bounds on how many items of each list go into a prompt, so unusually
+# large evidence or regulation data can't blow up the prompt size. Citation
+# details are never truncated; the evidence cap sits well above the number of
+# fields the questionnaire can produce.
+MAX_EVIDENCE_FIELDS = 32
+MAX_REGULATIONS = 8
+MAX_KEY_POINTS = 8
+
+# Returned instead of a letter when none of the requested angles are known.
+NO_ANGLES_MESSAGE = "No appeal angles selected; unable to generate letter."
+
+# google.generativeai is imported on first use (see _load_genai): it pulls in
+# gRPC and protobuf, which code paths that never call the API shouldn't pay for.
+genai = None
+
+
+def _bullets(items: List[str], indent: str = "") -> str:
+    """Render items as "- item" lines, each ending in a newline."""
+    if not items:
+        return ""
+    prefix = indent + "- "
+    return prefix + ("\n" + prefix).join(items) + "\n"
+
+
+@lru_cache(maxsize=256)
+def _titleize(key: str) -> str:
+    """Turn a field key such as 'has_photos' into a label such as 'Has Photos'."""
+    return key.replace('_', ' ').title()
+
+
+# Citation fields collected by the questionnaire; with the regulation table
+# fields below they make up nearly every key that reaches a prompt.
+_CITATION_FIELDS = (
+    'citation_number', 'citation_date', 'citation_time', 'location', 'violation_type',
+    'fine_amount', 'license_plate', 'vehicle_make', 'vehicle_model', 'vehicle_color',
+    'incorrect_vehicle_info', 'time_incorrect', 'unclear_signage', 'meter_malfunction',
+    'paid_for_parking', 'paid_not_displayed', 'payment_method', 'emergency_situation',
+    'emergency_description', 'has_disability_placard', 'first_violation', 'additional_info',
+)
+
+
+def _known_keys():
+    """Yield the citation, state and city field keys known at import time."""
+    yield from _CITATION_FIELDS
+    for table in (STATE_REGULATIONS, RegulationDatabase.CITY_REGULATIONS):
+        for info in table.values():
+            yield from info
+
+
+# Display labels for known keys, built once; other keys fall back to _titleize.
+_KEY_DISPLAY: Mapping[str, str] = MappingProxyType({key: _titleize(key) for key in _known_keys()})
+
+
+def _field_bullets(data: Dict, limit: Optional[int] = None) -> str:
+    """Render the truthy entries of a dict (the first ``limit`` if given) as "- Key Name: value" lines."""
+    display = _KEY_DISPLAY
+    return "".join(islice(
+        (
+            f"- {display.get(key) or _titleize(key)}: {value}\n"
+            for key, value in data.items() if value
+        ),
+        limit,
+    ))
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _load_genai():
+    """Import google.generativeai on first use and return the module."""
+    global genai
+    if genai is None:
+        import google.generativeai as genai_module
+        genai = genai_module
+    return genai
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Whether an API error is a rate limit or server-side failure worth retrying."""
+    from google.api_core import exceptions
+    return isinstance(exc, (exceptions.TooManyRequests, exceptions.ServerError))
+
+
+def _run_async(coro):
+    """
+    Run a coroutine on the shared background event loop and wait for its result.
+
+    The Gemini SDK caches its async client, which stays bound to the first event
+    loop it is used on, so every batch is scheduled on one long-lived loop
+    instead of a fresh ``asyncio.run`` loop per call.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="appeal-generator-loop", daemon=True
+            ).start()
+    return asyncio.run_coroutine_threadsafe(coro, _loop).result()
+
 
 class AppealGenerator:
     """Generates parking citation appeals using AI analysis."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    _MODEL_NAME = 'gemini-exp-1206'  # Using Gemini 2.0 Pro preview
+
+    # Models are shared by every generator using the same API key, and the SDK
+    # (whose configuration is process-wide) is only reconfigured when the key changes.
+    _models: Dict[str, object] = {}
+    _configured_key_hash: Optional[str] = None
+    _model_lock = threading.Lock()
+
+    # Instructions shared by every request. They are sent once per request as the
+    # model's system instruction instead of being repeated inside each prompt,
+    # which keeps the per-call prompts down to the case-specific content.
+    _SYSTEM_INSTRUCTION = """You are an expert legal assistant specializing in parking citation appeals.
+
+TONE REQUIREMENTS FOR APPEAL LETTERS:
+- Professional and respectful
+- Factual and objective
+- Confident but not aggressive
+- Empathetic where appropriate
+- Legally informed
+
+GUIDELINES FOR APPEAL LETTERS:
+- Do NOT fabricate facts or evidence not provided
+- Cite specific regulations when applicable
+- Use formal business letter format
+- Be specific about dates, times, and locations
+- Request specific relief (dismissal or reduction of fine)"""
+
+    # Prompt templates. The static instructions are built once here; each call
+    # only formats the dynamic blocks into the named placeholders.
+    _APPEAL_PROMPT_TEMPLATE = """Your task is to write a compelling, professional, and legally sound appeal letter.
+
+APPEAL STRATEGY: {angle_name}
+STRATEGY DESCRIPTION: {angle_description}
+
+CITATION DETAILS:
+{citation_block}
+
+JURISDICTION INFORMATION:
+{jurisdiction_block}
+
+AVAILABLE EVIDENCE:
+{evidence_block}
+
+KEY POINTS FOR THIS APPEAL ANGLE:
+{key_points_block}
+
+REQUIRED STRUCTURE:
+1. Opening: Brief, professional greeting and statement of purpose
+2. Citation Information: Reference the citation number, date, location
+3. Main Argument: Present the {angle_name} case clearly and persuasively
+4. Supporting Evidence: Reference all available evidence that supports this angle
+5. Legal/Regulatory Basis: Cite relevant regulations from the jurisdiction
+6. Conclusion: Respectful request for dismissal or reduction
+7. Closing: Professional sign-off
+
+Keep the letter concise (300-500 words ideal).
+
+Generate the appeal letter now:"""
+
+    _ANALYSIS_PROMPT_TEMPLATE = """Analyze this parking citation situation and provide a brief assessment of the likelihood of a successful appeal.
+
+CITATION DETAILS:
+{citation_block}
+
+JURISDICTION:
+{jurisdiction_block}
+
+AVAILABLE EVIDENCE:
+{evidence_block}
+
+Provide a concise analysis including:
+1. Overall appeal strength (Strong/Moderate/Weak)
+2. Best appeal angles to pursue (top 2-3)
+3. Key factors supporting the appeal
+4. Potential weaknesses to address
+5. Recommended next steps
+
+Keep the analysis under 300 words."""
+
+    _FOLLOW_UP_PROMPT_TEMPLATE = """Based on this parking citation appeal case, suggest 3-5 specific questions
+that would help gather additional information to strengthen the appeal.
+
+APPEAL ANGLE: {angle_name}
+CURRENT INFORMATION:
+{citation_block}
+
+STANDARD QUESTIONS FOR THIS ANGLE:
+{standard_questions_block}
+
+Generate additional specific questions that:
+1. Are directly relevant to this specific situation
+2. Would uncover helpful evidence or details
+3. Are clear and easy to answer
+4. Haven't already been covered
+
+Return ONLY a JSON array of 3 to 5 question strings, no prose."""
+
+    _COMPREHENSIVE_PROMPT_TEMPLATE = """Write a single, comprehensive appeal letter that strategically incorporates multiple strong arguments.
+
+CITATION DETAILS:
+{citation_block}
+
+JURISDICTION:
+State: {state_name}
+Appeal Deadline: {deadline_days} days
+{regulations_block}
+
+AVAILABLE EVIDENCE:
+{evidence_block}
+
+APPEAL ANGLES TO INCORPORATE:
+{angles_block}
+
+Create a single, unified appeal letter that:
+1. Opens professionally with citation reference
+2. Presents the strongest arguments from the available angles
+3. Weaves multiple points together coherently (don't list angles separately)
+4. Cites relevant regulations and laws
+5. References all supporting evidence naturally
+6. Maintains a respectful, professional tone throughout
+7. Concludes with a clear request for relief
+
+The letter should read as a cohesive whole, not as separate sections for each angle.
+Aim for 400-600 words. Use formal business letter format."""
+
+    # Appended to the comprehensive prompt by generate_appeal_and_analysis.
+    _APPEAL_AND_ANALYSIS_TASK = """
+
+Also assess the case, and respond with a JSON object containing:
+"appeal": the complete appeal letter described above.
+"analysis": a concise assessment of the likelihood of a successful appeal (under 300 words)
+covering overall appeal strength (Strong/Moderate/Weak), the best appeal angles to pursue (top 2-3),
+key factors supporting the appeal, potential weaknesses to address, and recommended next steps."""
+
+    _APPEAL_AND_ANALYSIS_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "appeal": {"type": "string"},
+            "analysis": {"type": "string"},
+        },
+        "required": ["appeal", "analysis"],
+    }
+
+    _BUNDLE_PROMPT_TEMPLATE = """Review this parking citation case and complete every task below in a single JSON response.
+
+CITATION DETAILS:
+{citation_block}
+
+JURISDICTION:
+{jurisdiction_block}
+
+AVAILABLE EVIDENCE:
+{evidence_block}
+
+APPEAL ANGLES:
+{angles_block}
+
+TASKS:
+1. "analysis": A concise assessment of the likelihood of a successful appeal (under 300 words)
+covering overall appeal strength (Strong/Moderate/Weak), the best appeal angles to pursue (top 2-3),
+key factors supporting the appeal, potential weaknesses to address, and recommended next steps.
+2. "follow_up_questions": 3-5 specific, easy to answer questions that would uncover additional
+evidence or details for the first appeal angle and are not already covered by its standard questions.
+3. "appeals": {appeals_task}"""
+
+    _BUNDLE_APPEALS_TASK = """One entry per appeal angle above, with "angle" set to the angle name
+exactly as written and "appeal" set to a professional appeal letter (300-500 words, formal business
+letter format) that argues that angle, cites the jurisdiction's regulations, references only the
+evidence provided, and requests dismissal or reduction of the fine."""
+
+    _BUNDLE_RESPONSE_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "analysis": {"type": "string"},
+            "follow_up_questions": {"type": "array", "items": {"type": "string"}},
+            "appeals": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "angle": {"type": "string"},
+                        "appeal": {"type": "string"},
+                    },
+                    "required": ["angle", "appeal"],
+                },
+            },
+        },
+        "required": ["analysis", "follow_up_questions", "appeals"],
+    }
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: bool = True,
+        cache_dir: Optional[str] = None,
+    ):
         """
         Initialize the appeal generator.
 
         Args:
             api_key: Google Generative AI API key. If not provided, will look for
                     GOOGLE_GENERATIVE_AI_API_KEY environment variable.
+            cache: Reuse the response for a prompt that was already answered
+                    instead of calling the API again.
+            cache_dir: Directory for a response cache that survives restarts
+                    (requires the optional diskcache package). If not provided,
+                    responses are cached in memory.
         """
         self.api_key = api_key or os.getenv("GOOGLE_GENERATIVE_AI_API_KEY")
         if not self.api_key:
@@ -27,8 +354,85 @@ class AppealGenerator:
                 "or pass api_key parameter."
             )
 
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-exp-1206')  # Using Gemini 2.0 Pro preview
+        self.model = self._get_model(self.api_key)
+
+        self._cache = None
+        # Guards in-memory cache eviction: one generator is shared by request
+        # threads, the task pool and the asyncio loop thread.
+        self._cache_lock = threading.Lock()
+        if cache and cache_dir:
+            if diskcache is None:
+                raise ImportError(
+                    "A persistent response cache requires the diskcache package "
+                    "(pip install diskcache)."
+                )
+            self._cache = diskcache.Cache(os.path.expanduser(cache_dir))
+        elif cache:
+            self._cache = {}
+
+    @classmethod
+    def _get_model(cls, api_key: str):
+        """Get the shared model for an API key, configuring the SDK if the key changed."""
+        key_hash = hashlib.blake2b(api_key.encode(), digest_size=16).hexdigest()
+        with cls._model_lock:
+            if key_hash != cls._configured_key_hash:
+                _load_genai().configure(api_key=api_key)
+                cls._configured_key_hash = key_hash
+            model = cls._models.get(key_hash)
+            if model is None:
+                model = cls._models[key_hash] = genai.GenerativeModel(
+                    cls._MODEL_NAME,
+                    system_instruction=cls._SYSTEM_INSTRUCTION,
+                )
+        return model
+
+    @staticmethod
+    def _prompt_key(prompt: str) -> str:
+        """Get the response cache key for a prompt."""
+        return hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+
+    def _cache_response(self, key: str, text: str) -> None:
+        """Store a response, evicting the oldest in-memory entry when full."""
+        if not isinstance(self._cache, dict):
+            self._cache[key] = text
+            return
+        with self._cache_lock:
+            if len(self._cache) >= RESPONSE_CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)), None)
+            self._cache[key] = text
+
+    def _cached_generate(self, prompt: str, generation_config=None, parse=None):
+        """
+        Get the model's response, reusing the cached answer for a repeat prompt.
+
+        When parse is given, the response text is passed through it and its
+        result returned. A reply that parse rejects by raising is not cached,
+        so the next call asks the model again.
+        """
+        key = None
+        if self._cache is not None:
+            key = self._prompt_key(prompt)
+            text = self._cache.get(key)
+            if text is not None:
+                return parse(text) if parse else text
+
+        text = self._generate_with_retry(prompt, generation_config)
+        result = parse(text) if parse else text
+        if key is not None:
+            self._cache_response(key, text)
+        return result
+
+    def _generate_with_retry(self, prompt: str, generation_config=None) -> str:
+        """Get the model's response text, backing off and retrying transient errors."""
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return self.model.generate_content(
+                    prompt, generation_config=generation_config
+                ).text
+            except Exception as e:
+                if attempt == MAX_RETRIES or not _is_transient(e):
+                    raise
+                time.sleep(RETRY_BASE_DELAY * 2 ** attempt)
 
     def generate_multi_angle_appeal(
         self,
@@ -40,6 +444,9 @@ class AppealGenerator:
         """
         Generate appeals from multiple angles.
 
+        The appeal for each angle is requested concurrently, so the total wait is
+        roughly one round trip rather than one per angle.
+
         Args:
             citation_details: Details about the citation
             location_info: City and state regulation information
@@ -49,24 +456,206 @@ class AppealGenerator:
         Returns:
             Dictionary mapping angle names to generated appeal text
         """
-        appeals = {}
+        angles = self._resolve_angles(selected_angles)
+        if not angles:
+            return {}
 
-        for angle_key in selected_angles:
-            angle = AppealStrategyAnalyzer.get_angle(angle_key)
-            if angle:
-                appeal_text = self._generate_single_angle_appeal(
-                    citation_details, location_info, angle, evidence
-                )
-                appeals[angle.name] = appeal_text
+        return _run_async(self._gather_angle_appeals(
+            citation_details, location_info, angles, evidence
+        ))
+
+    def generate_all_appeals(
+        self,
+        citation_details: Dict,
+        location_info: Dict,
+        selected_angles: List[str],
+        evidence: Dict,
+    ) -> Dict:
+        """
+        Generate the individual angle appeals and the comprehensive appeal together.
+
+        The comprehensive letter is requested alongside the per-angle letters
+        from the same event loop instead of after them.
+
+        Returns:
+            Dictionary with 'individual' (angle name -> appeal text) and
+            'comprehensive' (unified appeal text) entries
+        """
+        angles = self._resolve_angles(selected_angles)
+        if not angles:
+            return {'individual': {}, 'comprehensive': NO_ANGLES_MESSAGE}
+
+        return _run_async(self._gather_all_appeals(
+            citation_details, location_info, angles, evidence
+        ))
+
+    def generate_appeal_and_analysis(
+        self,
+        citation_details: Dict,
+        location_info: Dict,
+        selected_angles: List[str],
+        evidence: Dict,
+        include_analysis: bool = True,
+    ) -> Dict:
+        """
+        Generate the comprehensive appeal and the case strength analysis together.
+
+        Both come back from a single JSON request, so the citation, jurisdiction
+        and evidence context is sent (and paid for) once rather than twice.
+
+        Returns:
+            Dictionary with 'appeal' (the generate_comprehensive_appeal text) and
+            'analysis' (the analyze_citation_strength result, or None when
+            include_analysis is False) entries
+        """
+        if not include_analysis:
+            return {
+                'appeal': self.generate_comprehensive_appeal(
+                    citation_details, location_info, selected_angles, evidence
+                ),
+                'analysis': None,
+            }
+
+        angles = self._resolve_angles(selected_angles)
+        if not angles:
+            return {
+                'appeal': NO_ANGLES_MESSAGE,
+                'analysis': self.analyze_citation_strength(
+                    citation_details, location_info, evidence
+                ),
+            }
+
+        prompt = self._build_comprehensive_prompt(
+            citation_details, location_info, angles, evidence
+        ) + self._APPEAL_AND_ANALYSIS_TASK
+
+        def parse(response_text: str) -> Dict:
+            data = _json.loads(response_text)
+            return {
+                'appeal': data["appeal"],
+                'analysis': {
+                    "success": True,
+                    "analysis": data["analysis"],
+                },
+            }
+
+        try:
+            return self._cached_generate(prompt, _load_genai().GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=self._APPEAL_AND_ANALYSIS_SCHEMA,
+            ), parse)
+        except Exception as e:
+            return {
+                'appeal': f"Error generating comprehensive appeal: {str(e)}",
+                'analysis': {
+                    "success": False,
+                    "error": str(e),
+                },
+            }
+
+    def generate_batch(self, cases: List[Dict]) -> List[str]:
+        """
+        Generate comprehensive appeals for several citations at once.
+
+        The letters are requested concurrently (at most MAX_CONCURRENT_REQUESTS
+        at a time), so a batch takes about as long as its slowest few letters.
+
+        Args:
+            cases: One dictionary per citation with 'citation_details',
+                'location_info', 'selected_angles' and 'evidence' entries, as
+                passed to generate_comprehensive_appeal
+
+        Returns:
+            Appeal texts in the same order as cases
+        """
+        if not cases:
+            return []
+        return _run_async(self._gather_batch(cases))
+
+    async def _gather_batch(self, cases: List[Dict]) -> List[str]:
+        """Request the comprehensive appeal for every case concurrently."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def generate(case: Dict) -> str:
+            angles = self._resolve_angles(case['selected_angles'])
+            if not angles:
+                return NO_ANGLES_MESSAGE
+            return await self._generate_comprehensive_appeal_async(
+                case['citation_details'], case['location_info'], angles,
+                case['evidence'], semaphore,
+            )
+
+        return list(await asyncio.gather(*map(generate, cases)))
+
+    async def _gather_all_appeals(
+        self,
+        citation_details: Dict,
+        location_info: Dict,
+        angles: List[AppealAngle],
+        evidence: Dict,
+    ) -> Dict:
+        """Run the multi-angle batch and the comprehensive appeal concurrently."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        individual, comprehensive = await asyncio.gather(
+            self._gather_angle_appeals(
+                citation_details, location_info, angles, evidence, semaphore
+            ),
+            self._generate_comprehensive_appeal_async(
+                citation_details, location_info, angles, evidence, semaphore
+            ),
+        )
+        return {
+            'individual': individual,
+            'comprehensive': comprehensive,
+        }
+
+    async def _gather_angle_appeals(
+        self,
+        citation_details: Dict,
+        location_info: Dict,
+        angles: List[AppealAngle],
+        evidence: Dict,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Dict[str, str]:
+        """Dispatch one appeal request per angle and collect the results."""
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        tasks = [
+            asyncio.create_task(self._generate_single_angle_appeal(
+                citation_details, location_info, angle, evidence, semaphore
+            ))
+            for angle in angles
+        ]
+        appeal_texts = await asyncio.gather(*tasks)
 
-        return appeals
+        return {angle.name: text for angle, text in zip(angles, appeal_texts)}
 
-    def _generate_single_angle_appeal(
+    def _generate_streaming(self, prompt: str) -> Iterator[str]:
+        """Yield the model's response text in chunks as it is generated."""
+        key = None
+        if self._cache is not None:
+            key = self._prompt_key(prompt)
+            text = self._cache.get(key)
+            if text is not None:
+                yield text
+                return
+
+        chunks = []
+        for chunk in self.model.generate_content(prompt, stream=True):
+            chunks.append(chunk.text)
+            yield chunk.text
+
+        if key is not None:
+            self._cache_response(key, "".join(chunks))
+
+    async def _generate_single_angle_appeal(
         self,
         citation_details: Dict,
         location_info: Dict,
         angle: AppealAngle,
         evidence: Dict,
+        semaphore: asyncio.Semaphore,
     ) -> str:
         """Generate an appeal for a single angle."""
 
@@ -74,11 +663,43 @@ class AppealGenerator:
         prompt = self._build_appeal_prompt(citation_details, location_info, angle, evidence)
 
         try:
-            response = self.model.generate_content(prompt)
-            return response.text
+            return await self._call_async(prompt, semaphore)
         except Exception as e:
             return f"Error generating appeal: {str(e)}"
 
+    async def _call_async(self, prompt: str, semaphore: asyncio.Semaphore) -> str:
+        """Send a prompt to the model without blocking the event loop."""
+        key = None
+        if self._cache is not None:
+            key = self._prompt_key(prompt)
+            text = self._cache.get(key)
+            if text is not None:
+                return text
+
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                async with semaphore:
+                    response = await self.model.generate_content_async(prompt)
+                break
+            except Exception as e:
+                if attempt == MAX_RETRIES or not _is_transient(e):
+                    raise
+            # Back off outside the semaphore so other angles can use the slot
+            await asyncio.sleep(RETRY_BASE_DELAY * 2 ** attempt)
+
+        if key is not None:
+            self._cache_response(key, response.text)
+        return response.text
+
+    @staticmethod
+    def _resolve_angles(angle_keys: List[str]) -> List[AppealAngle]:
+        """Look up each angle key once, skipping unknown keys."""
+        return [
+            angle
+            for angle_key in angle_keys
+            if (angle := AppealStrategyAnalyzer.get_angle(angle_key)) is not None
+        ]
+
     def _build_appeal_prompt(
         self,
         citation_details: Dict,
@@ -91,78 +712,29 @@ class AppealGenerator:
         state_info = location_info.get("state", {})
         city_info = location_info.get("city", {})
 
-        prompt = f"""You are an expert legal assistant specializing in parking citation appeals.
-Your task is to write a compelling, professional, and legally sound appeal letter.
-
-APPEAL STRATEGY: {angle.name}
-STRATEGY DESCRIPTION: {angle.description}
-
-CITATION DETAILS:
-"""
-
-        # Add citation information
-        for key, value in citation_details.items():
-            if value:
-                prompt += f"- {key.replace('_', ' ').title()}: {value}\n"
-
-        prompt += "\n\nJURISDICTION INFORMATION:\n"
-
         # Add jurisdiction info
+        jurisdiction = []
         if state_info:
-            prompt += f"State: {state_info.get('name', 'Unknown')}\n"
-            prompt += f"Appeal Deadline: {state_info.get('statute_limitations_days', 'Unknown')} days from citation\n"
+            jurisdiction.append(f"State: {state_info.get('name', 'Unknown')}\n")
+            jurisdiction.append(f"Appeal Deadline: {state_info.get('statute_limitations_days', 'Unknown')} days from citation\n")
             if state_info.get('common_defenses'):
-                prompt += "\nRelevant State Regulations:\n"
-                for defense in state_info['common_defenses']:
-                    prompt += f"- {defense}\n"
+                jurisdiction.append("\nRelevant State Regulations:\n")
+                jurisdiction.append(_bullets(state_info['common_defenses'][:MAX_REGULATIONS]))
 
         if city_info:
-            prompt += f"\nCity-Specific Information:\n"
+            jurisdiction.append("\nCity-Specific Information:\n")
             if city_info.get('specific_rules'):
-                for rule in city_info['specific_rules']:
-                    prompt += f"- {rule}\n"
-            prompt += f"Online Appeal Available: {city_info.get('online_appeal', 'Unknown')}\n"
-
-        prompt += "\n\nAVAILABLE EVIDENCE:\n"
-
-        # Add evidence
-        for key, value in evidence.items():
-            if value:
-                prompt += f"- {key.replace('_', ' ').title()}: {value}\n"
-
-        prompt += f"\n\nKEY POINTS FOR THIS APPEAL ANGLE:\n"
-        for point in angle.strength_indicators:
-            prompt += f"- {point}\n"
-
-        prompt += f"""
-
-REQUIRED STRUCTURE:
-1. Opening: Brief, professional greeting and statement of purpose
-2. Citation Information: Reference the citation number, date, location
-3. Main Argument: Present the {angle.name} case clearly and persuasively
-4. Supporting Evidence: Reference all available evidence that supports this angle
-5. Legal/Regulatory Basis: Cite relevant regulations from the jurisdiction
-6. Conclusion: Respectful request for dismissal or reduction
-7. Closing: Professional sign-off
-
-TONE REQUIREMENTS:
-- Professional and respectful
-- Factual and objective
-- Confident but not aggressive
-- Empathetic where appropriate
-- Legally informed
-
-IMPORTANT GUIDELINES:
-- Do NOT fabricate facts or evidence not provided
-- Cite specific regulations when applicable
-- Keep the letter concise (300-500 words ideal)
-- Use formal business letter format
-- Be specific about dates, times, and locations
-- Request specific relief (dismissal or reduction of fine)
-
-Generate the appeal letter now:"""
-
-        return prompt
+                jurisdiction.append(_bullets(city_info['specific_rules'][:MAX_REGULATIONS]))
+            jurisdiction.append(f"Online Appeal Available: {city_info.get('online_appeal', 'Unknown')}\n")
+
+        return self._APPEAL_PROMPT_TEMPLATE.format_map({
+            'angle_name': angle.name,
+            'angle_description': angle.description,
+            'citation_block': _field_bullets(citation_details),
+            'jurisdiction_block': "".join(jurisdiction),
+            'evidence_block': _field_bullets(evidence, MAX_EVIDENCE_FIELDS),
+            'key_points_block': _bullets(angle.strength_indicators[:MAX_KEY_POINTS]),
+        })
 
     def analyze_citation_strength(
         self,
@@ -176,32 +748,12 @@ Generate the appeal letter now:"""
         Returns:
             Dictionary with analysis results
         """
-        prompt = f"""You are a parking citation appeal expert. Analyze this situation and provide
-a brief assessment of the likelihood of a successful appeal.
-
-CITATION DETAILS:
-{self._format_dict(citation_details)}
-
-JURISDICTION:
-{self._format_dict(location_info.get('state', {}))}
-
-AVAILABLE EVIDENCE:
-{self._format_dict(evidence)}
-
-Provide a concise analysis including:
-1. Overall appeal strength (Strong/Moderate/Weak)
-2. Best appeal angles to pursue (top 2-3)
-3. Key factors supporting the appeal
-4. Potential weaknesses to address
-5. Recommended next steps
-
-Keep the analysis under 300 words."""
+        prompt = self._build_analysis_prompt(citation_details, location_info, evidence)
 
         try:
-            response = self.model.generate_content(prompt)
             return {
                 "success": True,
-                "analysis": response.text,
+                "analysis": self._cached_generate(prompt),
             }
         except Exception as e:
             return {
@@ -209,6 +761,19 @@ Keep the analysis under 300 words."""
                 "error": str(e),
             }
 
+    def _build_analysis_prompt(
+        self,
+        citation_details: Dict,
+        location_info: Dict,
+        evidence: Dict,
+    ) -> str:
+        """Build the prompt for analyze_citation_strength."""
+        return self._ANALYSIS_PROMPT_TEMPLATE.format_map({
+            'citation_block': self._format_dict(citation_details),
+            'jurisdiction_block': self._format_dict(location_info.get('state', {})),
+            'evidence_block': self._format_dict(evidence, MAX_EVIDENCE_FIELDS),
+        })
+
     def suggest_follow_up_questions(
         self,
         citation_details: Dict,
@@ -220,46 +785,100 @@ Keep the analysis under 300 words."""
         Returns:
             List of suggested questions
         """
-        prompt = f"""Based on this parking citation appeal case, suggest 3-5 specific questions
-that would help gather additional information to strengthen the appeal.
+        prompt = self._FOLLOW_UP_PROMPT_TEMPLATE.format_map({
+            'angle_name': angle.name,
+            'citation_block': self._format_dict(citation_details),
+            'standard_questions_block': _bullets(angle.key_questions).rstrip("\n"),
+        })
 
-APPEAL ANGLE: {angle.name}
-CURRENT INFORMATION:
-{self._format_dict(citation_details)}
+        def parse(response_text: str) -> List[str]:
+            return _json.loads(response_text)[:5]  # Limit to 5 questions
 
-STANDARD QUESTIONS FOR THIS ANGLE:
-{chr(10).join(f"- {q}" for q in angle.key_questions)}
+        try:
+            return self._cached_generate(prompt, _load_genai().GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=list[str],
+            ), parse)
+        except Exception as e:
+            return [f"Error generating questions: {str(e)}"]
 
-Generate additional specific questions that:
-1. Are directly relevant to this specific situation
-2. Would uncover helpful evidence or details
-3. Are clear and easy to answer
-4. Haven't already been covered
+    def generate_bundle(
+        self,
+        citation_details: Dict,
+        location_info: Dict,
+        angles: List[str],
+        evidence: Dict,
+        include_appeals: bool = True,
+    ) -> Dict:
+        """
+        Get the case analysis, follow-up questions and per-angle appeals in one request.
 
-Format: Return only the questions, one per line, numbered."""
+        Equivalent to calling analyze_citation_strength, suggest_follow_up_questions
+        (for the first angle) and generate_multi_angle_appeal, but with a single
+        API round trip that returns structured JSON.
+
+        Args:
+            citation_details: Details about the citation
+            location_info: City and state regulation information
+            angles: List of appeal angle keys to pursue
+            evidence: Evidence available for the appeal
+            include_appeals: Whether to also write an appeal letter per angle
+
+        Returns:
+            Dictionary with 'success', 'analysis', 'follow_up_questions' and
+            'appeals' (angle name -> appeal text), or 'success' and 'error'
+        """
+        angle_details = self._resolve_angles(angles)
+
+        angles_block = []
+        for angle in angle_details:
+            angles_block.append(f"\n{angle.name}:\n")
+            angles_block.append(f"Description: {angle.description}\n")
+            angles_block.append("Key points:\n")
+            angles_block.append(_bullets(angle.strength_indicators[:MAX_KEY_POINTS], "  "))
+            angles_block.append("Standard questions:\n")
+            angles_block.append(_bullets(angle.key_questions, "  "))
+
+        prompt = self._BUNDLE_PROMPT_TEMPLATE.format_map({
+            'citation_block': self._format_dict(citation_details),
+            'jurisdiction_block': self._format_dict(location_info.get('state', {})),
+            'evidence_block': self._format_dict(evidence, MAX_EVIDENCE_FIELDS),
+            'angles_block': "".join(angles_block) or "None selected",
+            'appeals_task': (
+                self._BUNDLE_APPEALS_TASK if include_appeals and angle_details
+                else "Return an empty list."
+            ),
+        })
+
+        def parse(response_text: str) -> Dict:
+            data = _json.loads(response_text)
+            return {
+                "success": True,
+                "analysis": data.get("analysis", ""),
+                "follow_up_questions": data.get("follow_up_questions", [])[:5],
+                "appeals": {
+                    item["angle"]: item["appeal"]
+                    for item in data.get("appeals", [])
+                },
+            }
 
         try:
-            response = self.model.generate_content(prompt)
-            # Parse the response into a list
-            questions = [
-                line.strip().lstrip("0123456789.-) ").strip()
-                for line in response.text.split("\n")
-                if line.strip() and not line.strip().startswith("#")
-            ]
-            return questions[:5]  # Limit to 5 questions
+            return self._cached_generate(prompt, _load_genai().GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=self._BUNDLE_RESPONSE_SCHEMA,
+            ), parse)
         except Exception as e:
-            return [f"Error generating questions: {str(e)}"]
+            return {
+                "success": False,
+                "error": str(e),
+            }
 
-    def _format_dict(self, data: Dict) -> str:
-        """Format a dictionary for inclusion in prompts."""
+    def _format_dict(self, data: Dict, limit: Optional[int] = None) -> str:
+        """Format a dictionary for inclusion in prompts, keeping at most ``limit`` fields if given."""
         if not data:
             return "None provided"
 
-        formatted = ""
-        for key, value in data.items():
-            if value:
-                formatted += f"- {key.replace('_', ' ').title()}: {value}\n"
-        return formatted or "None provided"
+        return _field_bullets(data, limit) or "None provided"
 
     def generate_comprehensive_appeal(
         self,
@@ -274,63 +893,97 @@ Format: Return only the questions, one per line, numbered."""
         This creates a single unified appeal letter that strategically combines
         the strongest arguments from multiple angles.
         """
-        state_info = location_info.get("state", {})
-        city_info = location_info.get("city", {})
+        angles = self._resolve_angles(all_angles)
+        if not angles:
+            return NO_ANGLES_MESSAGE
 
-        # Get angle details
-        angle_details = [
-            AppealStrategyAnalyzer.get_angle(angle_key)
-            for angle_key in all_angles
-            if AppealStrategyAnalyzer.get_angle(angle_key)
-        ]
+        prompt = self._build_comprehensive_prompt(
+            citation_details, location_info, angles, evidence
+        )
 
-        prompt = f"""You are an expert legal assistant specializing in parking citation appeals.
-Write a single, comprehensive appeal letter that strategically incorporates multiple strong arguments.
+        try:
+            return self._cached_generate(prompt)
+        except Exception as e:
+            return f"Error generating comprehensive appeal: {str(e)}"
 
-CITATION DETAILS:
-{self._format_dict(citation_details)}
+    def stream_comprehensive_appeal(
+        self,
+        citation_details: Dict,
+        location_info: Dict,
+        all_angles: List[str],
+        evidence: Dict,
+    ) -> Iterator[str]:
+        """
+        Generate a comprehensive appeal, yielding the text as it arrives.
 
-JURISDICTION:
-State: {state_info.get('name', 'Unknown')}
-Appeal Deadline: {state_info.get('statute_limitations_days', 'Unknown')} days
-"""
+        Produces the same letter as generate_comprehensive_appeal, for callers
+        that want to show it while it is still being written.
+        """
+        angles = self._resolve_angles(all_angles)
+        if not angles:
+            yield NO_ANGLES_MESSAGE
+            return
 
-        if state_info.get('common_defenses'):
-            prompt += "\nRelevant Regulations:\n"
-            for defense in state_info['common_defenses']:
-                prompt += f"- {defense}\n"
+        prompt = self._build_comprehensive_prompt(
+            citation_details, location_info, angles, evidence
+        )
 
-        if city_info and city_info.get('specific_rules'):
-            prompt += "\nCity-Specific Rules:\n"
-            for rule in city_info['specific_rules']:
-                prompt += f"- {rule}\n"
+        try:
+            yield from self._generate_streaming(prompt)
+        except Exception as e:
+            yield f"Error generating comprehensive appeal: {str(e)}"
 
-        prompt += f"\n\nAVAILABLE EVIDENCE:\n{self._format_dict(evidence)}"
+    async def _generate_comprehensive_appeal_async(
+        self,
+        citation_details: Dict,
+        location_info: Dict,
+        angles: List[AppealAngle],
+        evidence: Dict,
+        semaphore: asyncio.Semaphore,
+    ) -> str:
+        """Async counterpart of generate_comprehensive_appeal."""
+        prompt = self._build_comprehensive_prompt(
+            citation_details, location_info, angles, evidence
+        )
 
-        prompt += "\n\nAPPEAL ANGLES TO INCORPORATE:\n"
-        for angle in angle_details:
-            prompt += f"\n{angle.name}:\n"
-            prompt += f"Description: {angle.description}\n"
-            prompt += "Key points:\n"
-            for point in angle.strength_indicators[:3]:  # Top 3 points per angle
-                prompt += f"  - {point}\n"
+        try:
+            return await self._call_async(prompt, semaphore)
+        except Exception as e:
+            return f"Error generating comprehensive appeal: {str(e)}"
 
-        prompt += """
+    def _build_comprehensive_prompt(
+        self,
+        citation_details: Dict,
+        location_info: Dict,
+        angle_details: List[AppealAngle],
+        evidence: Dict,
+    ) -> str:
+        """Build the prompt for the unified multi-angle appeal."""
+        state_info = location_info.get("state") or {}
+        city_info = location_info.get("city") or {}
 
-Create a single, unified appeal letter that:
-1. Opens professionally with citation reference
-2. Presents the strongest arguments from the available angles
-3. Weaves multiple points together coherently (don't list angles separately)
-4. Cites relevant regulations and laws
-5. References all supporting evidence naturally
-6. Maintains a respectful, professional tone throughout
-7. Concludes with a clear request for relief
+        regulations = []
+        if state_info.get('common_defenses'):
+            regulations.append("\nRelevant Regulations:\n")
+            regulations.append(_bullets(state_info['common_defenses'][:MAX_REGULATIONS]))
 
-The letter should read as a cohesive whole, not as separate sections for each angle.
-Aim for 400-600 words. Use formal business letter format."""
+        if city_info and city_info.get('specific_rules'):
+            regulations.append("\nCity-Specific Rules:\n")
+            regulations.append(_bullets(city_info['specific_rules'][:MAX_REGULATIONS]))
 
-        try:
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error generating comprehensive appeal: {str(e)}"
+        angles = []
+        for angle in angle_details:
+            angles.append(f"\n{angle.name}:\n")
+            angles.append(f"Description: {angle.description}\n")
+            angles.append("Key points:\n")
+            # Top 3 points per angle
+            angles.append(_bullets(angle.strength_indicators[:3], "  "))
+
+        return self._COMPREHENSIVE_PROMPT_TEMPLATE.format_map({
+            'citation_block': self._format_dict(citation_details),
+            'state_name': state_info.get('name', 'Unknown'),
+            'deadline_days': state_info.get('statute_limitations_days', 'Unknown'),
+            'regulations_block': "".join(regulations),
+            'evidence_block': self._format_dict(evidence, MAX_EVIDENCE_FIELDS),
+            'angles_block': "".join(angles),
+        })
@@ -2,302 +2,324 @@
 Different appeal strategies and angles for parking citations.
 """
 
-from typing import List, Dict
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Mapping, Sequence, Tuple
+from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppealAngle:
-    """Represents a specific angle or strategy for appealing a citation."""
+    """
+    Represents a specific angle or strategy for appealing a citation.
+
+    Instances are shared read-only definitions, so they are frozen and use
+    slots instead of a per-instance __dict__.
+    """
     name: str
     description: str
-    key_questions: List[str]
-    strength_indicators: List[str]
-    required_evidence: List[str]
+    key_questions: Tuple[str, ...] = field(default_factory=tuple)
+    strength_indicators: Tuple[str, ...] = field(default_factory=tuple)
+    required_evidence: Tuple[str, ...] = field(default_factory=tuple)
+    # Derived in __post_init__: the evidence dict key for each
+    # required_evidence item, and 1 / len(required_evidence) (0 when there is none).
+    required_evidence_keys: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _inv_len: float = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        object.__setattr__(self, 'required_evidence_keys', tuple(
+            item.lower().replace(" ", "_") for item in self.required_evidence
+        ))
+        object.__setattr__(
+            self, '_inv_len',
+            1 / len(self.required_evidence) if self.required_evidence else 0,
+        )
 
-class AppealStrategyAnalyzer:
-    """Analyzes citation details to identify viable appeal angles."""
 
-    APPEAL_ANGLES = {
-        "procedural_error": AppealAngle(
-            name="Procedural Error",
-            description="Citation was issued incorrectly or does not follow proper procedures",
-            key_questions=[
-                "Was the citation securely attached to your vehicle?",
-                "Are all details on the citation accurate (date, time, location, vehicle info)?",
-                "Did the officer follow proper procedures?",
-                "Is the citation number valid and legible?",
-            ],
-            strength_indicators=[
-                "Incorrect vehicle information",
-                "Wrong date or time",
-                "Citation not properly attached",
-                "Missing required information",
-                "Officer signature missing",
-            ],
-            required_evidence=[
-                "Photos of the citation showing errors",
-                "Vehicle registration showing correct information",
-                "Photos showing improper attachment if applicable",
-            ],
+# All known appeal angles by key. Read-only: angle definitions are shared.
+APPEAL_ANGLES: Mapping[str, AppealAngle] = MappingProxyType({
+    "procedural_error": AppealAngle(
+        name="Procedural Error",
+        description="Citation was issued incorrectly or does not follow proper procedures",
+        key_questions=(
+            "Was the citation securely attached to your vehicle?",
+            "Are all details on the citation accurate (date, time, location, vehicle info)?",
+            "Did the officer follow proper procedures?",
+            "Is the citation number valid and legible?",
+        ),
+        strength_indicators=(
+            "Incorrect vehicle information",
+            "Wrong date or time",
+            "Citation not properly attached",
+            "Missing required information",
+            "Officer signature missing",
+        ),
+        required_evidence=(
+            "Photos of the citation showing errors",
+            "Vehicle registration showing correct information",
+            "Photos showing improper attachment if applicable",
+        ),
+    ),
+    "signage_issues": AppealAngle(
+        name="Inadequate or Confusing Signage",
+        description="Parking restrictions were not clearly posted or signs were confusing",
+        key_questions=(
+            "Were there clear signs indicating the parking restriction?",
+            "Were the signs visible and unobstructed?",
+            "Were there conflicting signs in the area?",
+            "Was the sign text legible and in compliance with local standards?",
+        ),
+        strength_indicators=(
+            "No sign visible from parking spot",
+            "Sign obstructed by trees/objects",
+            "Conflicting information from multiple signs",
+            "Faded or illegible signs",
+            "Sign not meeting MUTCD standards",
+        ),
+        required_evidence=(
+            "Photos showing parking spot and nearby signage",
+            "Photos of any obstructions or damaged signs",
+            "Photos showing perspective from driver's position",
+            "Multiple angles showing sign placement",
+        ),
+    ),
+    "meter_malfunction": AppealAngle(
+        name="Meter or Payment System Malfunction",
+        description="The parking meter or payment system was not working properly",
+        key_questions=(
+            "Did you attempt to pay for parking?",
+            "Was the meter displaying any error messages?",
+            "Did you report the malfunction?",
+            "Do you have proof of attempted payment?",
+        ),
+        strength_indicators=(
+            "Meter displayed 'out of order'",
+            "Payment transaction failed but money charged",
+            "Receipt showing payment attempt",
+            "Multiple users reporting same issue",
+        ),
+        required_evidence=(
+            "Photos of meter showing malfunction",
+            "Payment receipts or transaction records",
+            "Credit card statement showing charge",
+            "Report filed about meter malfunction",
+        ),
+    ),
+    "emergency_circumstances": AppealAngle(
+        name="Emergency or Extenuating Circumstances",
+        description="Parking violation occurred due to an emergency situation",
+        key_questions=(
+            "What was the nature of the emergency?",
+            "Do you have documentation of the emergency?",
+            "Was this your first parking violation?",
+            "How long was the vehicle parked?",
         ),
-        "signage_issues": AppealAngle(
-            name="Inadequate or Confusing Signage",
-            description="Parking restrictions were not clearly posted or signs were confusing",
-            key_questions=[
-                "Were there clear signs indicating the parking restriction?",
-                "Were the signs visible and unobstructed?",
-                "Were there conflicting signs in the area?",
-                "Was the sign text legible and in compliance with local standards?",
-            ],
-            strength_indicators=[
-                "No sign visible from parking spot",
-                "Sign obstructed by trees/objects",
-                "Conflicting information from multiple signs",
-                "Faded or illegible signs",
-                "Sign not meeting MUTCD standards",
-            ],
-            required_evidence=[
-                "Photos showing parking spot and nearby signage",
-                "Photos of any obstructions or damaged signs",
-                "Photos showing perspective from driver's position",
-                "Multiple angles showing sign placement",
-            ],
+        strength_indicators=(
+            "Medical emergency",
+            "Vehicle breakdown",
+            "Avoiding accident",
+            "Personal safety concern",
+            "Family emergency",
         ),
-        "meter_malfunction": AppealAngle(
-            name="Meter or Payment System Malfunction",
-            description="The parking meter or payment system was not working properly",
-            key_questions=[
-                "Did you attempt to pay for parking?",
-                "Was the meter displaying any error messages?",
-                "Did you report the malfunction?",
-                "Do you have proof of attempted payment?",
-            ],
-            strength_indicators=[
-                "Meter displayed 'out of order'",
-                "Payment transaction failed but money charged",
-                "Receipt showing payment attempt",
-                "Multiple users reporting same issue",
-            ],
-            required_evidence=[
-                "Photos of meter showing malfunction",
-                "Payment receipts or transaction records",
-                "Credit card statement showing charge",
-                "Report filed about meter malfunction",
-            ],
+        required_evidence=(
+            "Medical records or doctor's note",
+            "Police report if applicable",
+            "Tow truck receipt or mechanic report",
+            "Photos showing vehicle condition",
+            "Witness statements if available",
         ),
-        "emergency_circumstances": AppealAngle(
-            name="Emergency or Extenuating Circumstances",
-            description="Parking violation occurred due to an emergency situation",
-            key_questions=[
-                "What was the nature of the emergency?",
-                "Do you have documentation of the emergency?",
-                "Was this your first parking violation?",
-                "How long was the vehicle parked?",
-            ],
-            strength_indicators=[
-                "Medical emergency",
-                "Vehicle breakdown",
-                "Avoiding accident",
-                "Personal safety concern",
-                "Family emergency",
-            ],
-            required_evidence=[
-                "Medical records or doctor's note",
-                "Police report if applicable",
-                "Tow truck receipt or mechanic report",
-                "Photos showing vehicle condition",
-                "Witness statements if available",
-            ],
+    ),
+    "payment_display_issue": AppealAngle(
+        name="Valid Payment Not Displayed",
+        description="Payment was made but receipt was not properly displayed",
+        key_questions=(
+            "Did you pay for parking before the citation was issued?",
+            "Do you have the parking receipt?",
+            "Why was the receipt not displayed?",
+            "What time was payment made vs. citation issued?",
         ),
-        "payment_display_issue": AppealAngle(
-            name="Valid Payment Not Displayed",
-            description="Payment was made but receipt was not properly displayed",
-            key_questions=[
-                "Did you pay for parking before the citation was issued?",
-                "Do you have the parking receipt?",
-                "Why was the receipt not displayed?",
-                "What time was payment made vs. citation issued?",
-            ],
-            strength_indicators=[
-                "Receipt timestamp before citation time",
-                "Payment for correct zone/meter",
-                "Receipt fell inside vehicle",
-                "Wind blew receipt away",
-            ],
-            required_evidence=[
-                "Original parking receipt",
-                "Credit card or app payment confirmation",
-                "Photos of receipt with timestamp",
-                "Transaction records from parking app",
-            ],
+        strength_indicators=(
+            "Receipt timestamp before citation time",
+            "Payment for correct zone/meter",
+            "Receipt fell inside vehicle",
+            "Wind blew receipt away",
         ),
-        "zone_confusion": AppealAngle(
-            name="Unclear Zone or Time Restrictions",
-            description="Zone boundaries or time restrictions were unclear or ambiguous",
-            key_questions=[
-                "Were zone boundaries clearly marked?",
-                "Were time restrictions clearly posted?",
-                "Were there multiple overlapping zones?",
-                "Was the zone map accurate?",
-            ],
-            strength_indicators=[
-                "No clear zone boundary markings",
-                "Conflicting zone signs",
-                "Time restriction periods unclear",
-                "Street cleaning schedule ambiguous",
-            ],
-            required_evidence=[
-                "Photos showing zone markings (or lack thereof)",
-                "Photos of relevant signage",
-                "Screenshot of official parking map if applicable",
-                "Photos showing perspective of parking location",
-            ],
+        required_evidence=(
+            "Original parking receipt",
+            "Credit card or app payment confirmation",
+            "Photos of receipt with timestamp",
+            "Transaction records from parking app",
         ),
-        "first_time_leniency": AppealAngle(
-            name="First-Time Violation / Good Record",
-            description="Request for leniency based on clean parking record",
-            key_questions=[
-                "Is this your first parking violation in this jurisdiction?",
-                "How long have you been parking in this area?",
-                "Do you have a generally good compliance record?",
-                "Was this an honest mistake?",
-            ],
-            strength_indicators=[
-                "No prior parking citations",
-                "Long-time resident or worker in area",
-                "Regular parker with good history",
-                "Simple misunderstanding of rules",
-            ],
-            required_evidence=[
-                "Driving record or DMV printout",
-                "Statement of good parking history",
-                "Proof of residency or employment in area",
-                "Character reference if applicable",
-            ],
+    ),
+    "zone_confusion": AppealAngle(
+        name="Unclear Zone or Time Restrictions",
+        description="Zone boundaries or time restrictions were unclear or ambiguous",
+        key_questions=(
+            "Were zone boundaries clearly marked?",
+            "Were time restrictions clearly posted?",
+            "Were there multiple overlapping zones?",
+            "Was the zone map accurate?",
         ),
-        "disability_accommodation": AppealAngle(
-            name="Disability-Related Accommodation",
-            description="Citation related to disability parking or accommodation needs",
-            key_questions=[
-                "Do you have a valid disability placard or license plate?",
-                "Was the placard properly displayed?",
-                "Was the accessible parking space properly marked?",
-                "Were you denied reasonable accommodation?",
-            ],
-            strength_indicators=[
-                "Valid disability placard not recognized",
-                "Accessible space markings faded or unclear",
-                "No accessible parking available",
-                "Time limit insufficient for disability needs",
-            ],
-            required_evidence=[
-                "Copy of disability placard documentation",
-                "Photos showing placard displayed",
-                "Photos of parking space markings",
-                "Medical documentation if relevant",
-            ],
+        strength_indicators=(
+            "No clear zone boundary markings",
+            "Conflicting zone signs",
+            "Time restriction periods unclear",
+            "Street cleaning schedule ambiguous",
         ),
-        "time_discrepancy": AppealAngle(
-            name="Time Discrepancy or Error",
-            description="Citation time is incorrect or conflicts with actual circumstances",
-            key_questions=[
-                "What time did you park?",
-                "What time did you leave?",
-                "Do you have proof of your timeline?",
-                "What time does the citation show?",
-            ],
-            strength_indicators=[
-                "Citation time impossible or implausible",
-                "Proof of being elsewhere at citation time",
-                "Multiple citations same time different locations",
-                "Meter time conflicts with citation time",
-            ],
-            required_evidence=[
-                "Timestamped photos or videos",
-                "Receipt or parking payment with timestamp",
-                "GPS or phone location data",
-                "Witness statements",
-                "Business receipts showing location at citation time",
-            ],
+        required_evidence=(
+            "Photos showing zone markings (or lack thereof)",
+            "Photos of relevant signage",
+            "Screenshot of official parking map if applicable",
+            "Photos showing perspective of parking location",
         ),
-    }
+    ),
+    "first_time_leniency": AppealAngle(
+        name="First-Time Violation / Good Record",
+        description="Request for leniency based on clean parking record",
+        key_questions=(
+            "Is this your first parking violation in this jurisdiction?",
+            "How long have you been parking in this area?",
+            "Do you have a generally good compliance record?",
+            "Was this an honest mistake?",
+        ),
+        strength_indicators=(
+            "No prior parking citations",
+            "Long-time resident or worker in area",
+            "Regular parker with good history",
+            "Simple misunderstanding of rules",
+        ),
+        required_evidence=(
+            "Driving record or DMV printout",
+            "Statement of good parking history",
+            "Proof of residency or employment in area",
+            "Character reference if applicable",
+        ),
+    ),
+    "disability_accommodation": AppealAngle(
+        name="Disability-Related Accommodation",
+        description="Citation related to disability parking or accommodation needs",
+        key_questions=(
+            "Do you have a valid disability placard or license plate?",
+            "Was the placard properly displayed?",
+            "Was the accessible parking space properly marked?",
+            "Were you denied reasonable accommodation?",
+        ),
+        strength_indicators=(
+            "Valid disability placard not recognized",
+            "Accessible space markings faded or unclear",
+            "No accessible parking available",
+            "Time limit insufficient for disability needs",
+        ),
+        required_evidence=(
+            "Copy of disability placard documentation",
+            "Photos showing placard displayed",
+            "Photos of parking space markings",
+            "Medical documentation if relevant",
+        ),
+    ),
+    "time_discrepancy": AppealAngle(
+        name="Time Discrepancy or Error",
+        description="Citation time is incorrect or conflicts with actual circumstances",
+        key_questions=(
+            "What time did you park?",
+            "What time did you leave?",
+            "Do you have proof of your timeline?",
+            "What time does the citation show?",
+        ),
+        strength_indicators=(
+            "Citation time impossible or implausible",
+            "Proof of being elsewhere at citation time",
+            "Multiple citations same time different locations",
+            "Meter time conflicts with citation time",
+        ),
+        required_evidence=(
+            "Timestamped photos or videos",
+            "Receipt or parking payment with timestamp",
+            "GPS or phone location data",
+            "Witness statements",
+            "Business receipts showing location at citation time",
+        ),
+    ),
+})
 
-    @classmethod
-    def get_all_angles(cls) -> Dict[str, AppealAngle]:
-        """Get all available appeal angles."""
-        return cls.APPEAL_ANGLES
+# Citation details that, when set, suggest each appeal angle.
+_ANGLE_TRIGGERS = {
+    "procedural_error": ("has_errors", "missing_info", "incorrect_vehicle_info"),
+    "signage_issues": ("unclear_signage", "no_visible_signs", "conflicting_signs"),
+    "meter_malfunction": ("meter_malfunction", "payment_failed", "paid_but_cited"),
+    "emergency_circumstances": ("emergency_situation",),
+    "payment_display_issue": ("paid_not_displayed", "receipt_not_visible"),
+    "zone_confusion": ("unclear_zone", "zone_boundary_unclear"),
+    "first_time_leniency": ("first_violation",),
+    "disability_accommodation": ("disability_related", "has_disability_placard"),
+    "time_discrepancy": ("time_incorrect", "timeline_conflicts"),
+}
 
-    @classmethod
-    def get_angle(cls, angle_key: str) -> AppealAngle:
-        """Get a specific appeal angle."""
-        return cls.APPEAL_ANGLES.get(angle_key)
+# Suggested when no trigger is set.
+_DEFAULT_ANGLES: Tuple[str, ...] = ("procedural_error", "signage_issues", "first_time_leniency")
 
-    @classmethod
-    def analyze_situation(cls, citation_details: Dict) -> List[str]:
-        """
-        Analyze citation details to suggest relevant appeal angles.
+# Inverted form of _ANGLE_TRIGGERS: trigger key -> angle key.
+_TRIGGER_TO_ANGLE = {
+    trigger: angle_key
+    for angle_key, triggers in _ANGLE_TRIGGERS.items()
+    for trigger in triggers
+}
 
-        Args:
-            citation_details: Dictionary containing citation information
+# Evidence dict key -> keys of the angles that list it as required evidence.
+_EVIDENCE_KEY_TO_ANGLES: Dict[str, Tuple[str, ...]] = {}
+for _angle_key, _angle in APPEAL_ANGLES.items():
+    for _evidence_key in _angle.required_evidence_keys:
+        _EVIDENCE_KEY_TO_ANGLES[_evidence_key] = (
+            _EVIDENCE_KEY_TO_ANGLES.get(_evidence_key, ()) + (_angle_key,)
+        )
+del _angle_key, _angle, _evidence_key
 
-        Returns:
-            List of relevant appeal angle keys
-        """
-        relevant_angles = []
 
-        # Check for procedural errors
-        if (citation_details.get("has_errors") or
-            citation_details.get("missing_info") or
-            citation_details.get("incorrect_vehicle_info")):
-            relevant_angles.append("procedural_error")
+def _strength_label(evidence_ratio: float) -> str:
+    """Map the share of required evidence present to a strength label."""
+    if evidence_ratio >= 0.7:
+        return "strong"
+    elif evidence_ratio >= 0.4:
+        return "moderate"
+    else:
+        return "weak"
 
-        # Check for signage issues
-        if (citation_details.get("unclear_signage") or
-            citation_details.get("no_visible_signs") or
-            citation_details.get("conflicting_signs")):
-            relevant_angles.append("signage_issues")
 
-        # Check for meter issues
-        if (citation_details.get("meter_malfunction") or
-            citation_details.get("payment_failed") or
-            citation_details.get("paid_but_cited")):
-            relevant_angles.append("meter_malfunction")
+class AppealStrategyAnalyzer:
+    """Analyzes citation details to identify viable appeal angles."""
 
-        # Check for emergency
-        if citation_details.get("emergency_situation"):
-            relevant_angles.append("emergency_circumstances")
+    APPEAL_ANGLES = APPEAL_ANGLES  # also reachable through the class, as before
 
-        # Check for payment display issue
-        if (citation_details.get("paid_not_displayed") or
-            citation_details.get("receipt_not_visible")):
-            relevant_angles.append("payment_display_issue")
+    # Get a specific appeal angle, or None for an unknown key.
+    get_angle = staticmethod(APPEAL_ANGLES.get)
 
-        # Check for zone confusion
-        if (citation_details.get("unclear_zone") or
-            citation_details.get("zone_boundary_unclear")):
-            relevant_angles.append("zone_confusion")
+    @classmethod
+    def get_all_angles(cls) -> Mapping[str, AppealAngle]:
+        """Get all available appeal angles (a read-only mapping)."""
+        return cls.APPEAL_ANGLES
 
-        # Check for first-time situation
-        if citation_details.get("first_violation"):
-            relevant_angles.append("first_time_leniency")
+    @classmethod
+    def analyze_situation(cls, citation_details: Dict) -> Sequence[str]:
+        """
+        Analyze citation details to suggest relevant appeal angles.
 
-        # Check for disability-related
-        if (citation_details.get("disability_related") or
-            citation_details.get("has_disability_placard")):
-            relevant_angles.append("disability_accommodation")
+        Args:
+            citation_details: Dictionary containing citation information
 
-        # Check for time issues
-        if (citation_details.get("time_incorrect") or
-            citation_details.get("timeline_conflicts")):
-            relevant_angles.append("time_discrepancy")
+        Returns:
+            Sequence of relevant appeal angle keys
+        """
+        hits = {
+            _TRIGGER_TO_ANGLE[key]
+            for key, value in citation_details.items()
+            if value and key in _TRIGGER_TO_ANGLE
+        }
 
         # If no specific angles identified, return a default set
-        if not relevant_angles:
-            relevant_angles = ["procedural_error", "signage_issues", "first_time_leniency"]
+        if not hits:
+            return _DEFAULT_ANGLES
 
-        return relevant_angles
+        # Report angles in their registry order
+        return [angle_key for angle_key in APPEAL_ANGLES if angle_key in hits]
 
     @classmethod
     def get_angle_strength(cls, angle_key: str, evidence: Dict) -> str:
@@ -310,20 +332,27 @@ class AppealStrategyAnalyzer:
         if not angle:
             return "weak"
 
-        evidence_count = 0
-        indicator_matches = 0
+        # Simple strength calculation: share of required evidence items present
+        evidence_count = sum(1 for key in angle.required_evidence_keys if evidence.get(key))
+        return _strength_label(evidence_count * angle._inv_len)
 
-        # Check if evidence items are present
-        for evidence_item in angle.required_evidence:
-            if evidence.get(evidence_item.lower().replace(" ", "_")):
-                evidence_count += 1
+    @classmethod
+    def get_all_angle_strengths(cls, evidence: Dict) -> Dict[str, str]:
+        """
+        Evaluate the strength of every appeal angle given evidence.
 
-        # Simple strength calculation
-        evidence_ratio = evidence_count / len(angle.required_evidence) if angle.required_evidence else 0
+        Same result as calling get_angle_strength for each angle, but the
+        evidence dict is scanned once instead of once per angle.
 
-        if evidence_ratio >= 0.7:
-            return "strong"
-        elif evidence_ratio >= 0.4:
-            return "moderate"
-        else:
-            return "weak"
+        Returns: Dictionary mapping angle keys to "strong", "moderate", or "weak"
+        """
+        counts = dict.fromkeys(APPEAL_ANGLES, 0)
+        for key, value in evidence.items():
+            if value:
+                for angle_key in _EVIDENCE_KEY_TO_ANGLES.get(key, ()):
+                    counts[angle_key] += 1
+
+        return {
+            angle_key: _strength_label(count * APPEAL_ANGLES[angle_key]._inv_len)
+            for angle_key, count in counts.items()
+        }
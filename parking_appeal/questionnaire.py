@@ -2,10 +2,44 @@
 Interactive questionnaire for gathering citation and evidence details.
 """
 
-from typing import Dict, List, Optional, Any
+import re
+import sys
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, Sequence
 from .regulations import RegulationDatabase
 from .appeal_strategies import AppealStrategyAnalyzer
 
+# Valid answers to select_from_list: one number, or comma-separated numbers.
+_NUMBER_RE = re.compile(r'\d+', re.ASCII)
+_NUMBER_LIST_RE = re.compile(r'\d+(?:\s*,\s*\d+)*', re.ASCII)
+
+# Accepted answers to get_yes_no.
+_YN = {"y": True, "yes": True, "n": False, "no": False}
+
+# Section banners, built once.
+_BAR = "=" * 60
+_HDR_BASIC = f"\n{_BAR}\nPARKING CITATION APPEAL - BASIC INFORMATION\n{_BAR}"
+_HDR_LOCATION = f"\n{_BAR}\nJURISDICTION INFORMATION\n{_BAR}"
+_HDR_VEHICLE = f"\n{_BAR}\nVEHICLE INFORMATION\n{_BAR}"
+_HDR_SITUATION = f"\n{_BAR}\nSITUATION DETAILS\n{_BAR}"
+_HDR_EVIDENCE = f"\n{_BAR}\nAVAILABLE EVIDENCE\n{_BAR}"
+_HDR_ANALYZING = f"\n{_BAR}\nANALYZING YOUR SITUATION...\n{_BAR}"
+_HDR_FOLLOW_UP = f"\n{_BAR}\nFOLLOW-UP QUESTIONS\n{_BAR}"
+_HDR_WELCOME = f"\n{'=' * 70}\n{' ' * 15}PARKING CITATION APPEAL ASSISTANT\n{'=' * 70}"
+_SEPARATOR = "\n" + "-" * 60
+
+# Follow-up answers: one line per question; "-" skips one, a blank line the rest.
+_SKIP_ANSWER = "-"
+_FOLLOW_UP_HINT = (
+    "\nAnswer one question per line, in order. "
+    f"Enter '{_SKIP_ANSWER}' to skip a question or a blank line to finish."
+)
+
+
+def _emit(*lines: str) -> None:
+    """Write several lines to the console in a single call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
 
 class InteractiveQuestionnaire:
     """Guides users through questions to gather appeal information."""
@@ -14,25 +48,33 @@ class InteractiveQuestionnaire:
         self.citation_details = {}
         self.evidence = {}
         self.location_info = {}
+        # Number of distinct has_* evidence types collected
+        self.evidence_count = 0
+        # Read-only live views handed to callers; update the dicts above instead.
+        self._citation_details_view = MappingProxyType(self.citation_details)
+        self._evidence_view = MappingProxyType(self.evidence)
+        self._location_info_view = MappingProxyType(self.location_info)
 
     def get_input(self, prompt: str, required: bool = True, default: Any = None) -> str:
         """Get input from user with optional default."""
-        if default:
-            prompt = f"{prompt} [{default}]: "
-        else:
-            prompt = f"{prompt}: "
-
+        prompt = f"{prompt} [{default}]: " if default else f"{prompt}: "
+
+        response = input(prompt).strip()
+        if response:
+            return response
+        if default is not None:
+            return str(default)
+        if not required:
+            return ""
+        return self._get_required(prompt)
+
+    def _get_required(self, prompt: str) -> str:
+        """Re-prompt until a required field gets a non-empty answer."""
         while True:
+            print("This field is required. Please provide a value.")
             response = input(prompt).strip()
-
             if response:
                 return response
-            elif default is not None:
-                return str(default)
-            elif not required:
-                return ""
-            else:
-                print("This field is required. Please provide a value.")
 
     def get_yes_no(self, prompt: str, default: Optional[bool] = None) -> bool:
         """Get a yes/no response from user."""
@@ -46,52 +88,47 @@ class InteractiveQuestionnaire:
         while True:
             response = input(prompt).strip().lower()
 
-            if response in ['y', 'yes']:
-                return True
-            elif response in ['n', 'no']:
-                return False
-            elif response == "" and default is not None:
+            answer = _YN.get(response)
+            if answer is not None:
+                return answer
+            if response == "" and default is not None:
                 return default
-            else:
-                print("Please enter 'y' for yes or 'n' for no.")
+            print("Please enter 'y' for yes or 'n' for no.")
 
     def select_from_list(self, prompt: str, options: List[str], allow_multiple: bool = False) -> List[str]:
         """Allow user to select from a list of options."""
-        print(f"\n{prompt}")
-        for i, option in enumerate(options, 1):
-            print(f"  {i}. {option}")
-
+        menu = "\n".join(f"  {i}. {option}" for i, option in enumerate(options, 1))
         if allow_multiple:
-            print("Enter numbers separated by commas (e.g., 1,3,5) or 'all':")
+            hint = "Enter numbers separated by commas (e.g., 1,3,5) or 'all':"
         else:
-            print("Enter the number of your selection:")
+            hint = "Enter the number of your selection:"
+        sys.stdout.write(f"\n{prompt}\n{menu}\n{hint}\n")
 
+        pattern = _NUMBER_LIST_RE if allow_multiple else _NUMBER_RE
         while True:
             response = input("> ").strip()
 
             if allow_multiple and response.lower() == 'all':
                 return options
 
-            try:
-                if allow_multiple:
-                    indices = [int(x.strip()) - 1 for x in response.split(',')]
-                else:
-                    indices = [int(response) - 1]
-
-                selected = [options[i] for i in indices if 0 <= i < len(options)]
-
-                if selected:
-                    return selected
-                else:
-                    print("Invalid selection. Please try again.")
-            except (ValueError, IndexError):
+            if not pattern.fullmatch(response):
                 print("Invalid input. Please enter valid numbers.")
+                continue
+
+            # Already validated, so every comma-separated part is an integer
+            selected = [
+                options[number - 1]
+                for number in map(int, response.split(','))
+                if 0 < number <= len(options)
+            ]
+
+            if selected:
+                return selected
+            print("Invalid selection. Please try again.")
 
-    def gather_basic_citation_info(self) -> Dict:
+    def gather_basic_citation_info(self) -> Mapping:
         """Gather basic citation information."""
-        print("\n" + "="*60)
-        print("PARKING CITATION APPEAL - BASIC INFORMATION")
-        print("="*60)
+        _emit(_HDR_BASIC)
 
         self.citation_details['citation_number'] = self.get_input("Citation Number")
         self.citation_details['citation_date'] = self.get_input("Citation Date (MM/DD/YYYY)")
@@ -100,23 +137,21 @@ class InteractiveQuestionnaire:
         self.citation_details['violation_type'] = self.get_input("Violation Type (e.g., 'expired meter', 'no parking zone')")
         self.citation_details['fine_amount'] = self.get_input("Fine Amount ($)", required=False)
 
-        return self.citation_details
+        return self._citation_details_view
 
-    def gather_location_info(self) -> Dict:
+    def gather_location_info(self) -> Mapping:
         """Gather location/jurisdiction information."""
-        print("\n" + "="*60)
-        print("JURISDICTION INFORMATION")
-        print("="*60)
-
         # Get state
         available_states = RegulationDatabase.get_all_states()
-        print(f"\nSupported states: {', '.join(available_states)}")
+        _emit(_HDR_LOCATION, f"\nSupported states: {', '.join(available_states)}")
         state = self.get_input("State (2-letter code, e.g., CA, NY, TX)").upper()
 
         # Validate state or accept anyway
         if state not in available_states:
-            print(f"Note: {state} is not in our database of detailed regulations.")
-            print("We'll still help you, but may have limited jurisdiction-specific information.")
+            _emit(
+                f"Note: {state} is not in our database of detailed regulations.",
+                "We'll still help you, but may have limited jurisdiction-specific information.",
+            )
 
         self.location_info['state'] = state
 
@@ -133,13 +168,11 @@ class InteractiveQuestionnaire:
         combined_info = RegulationDatabase.get_combined_info(city, state)
         self.location_info['regulations'] = combined_info
 
-        return self.location_info
+        return self._location_info_view
 
     def gather_vehicle_info(self) -> None:
         """Gather vehicle information."""
-        print("\n" + "="*60)
-        print("VEHICLE INFORMATION")
-        print("="*60)
+        _emit(_HDR_VEHICLE)
 
         self.citation_details['vehicle_make'] = self.get_input("Vehicle Make", required=False)
         self.citation_details['vehicle_model'] = self.get_input("Vehicle Model", required=False)
@@ -152,9 +185,7 @@ class InteractiveQuestionnaire:
 
     def gather_situation_details(self) -> None:
         """Gather details about the parking situation."""
-        print("\n" + "="*60)
-        print("SITUATION DETAILS")
-        print("="*60)
+        _emit(_HDR_SITUATION)
 
         # Key yes/no questions that help identify appeal angles
         self.citation_details['first_violation'] = self.get_yes_no(
@@ -208,13 +239,9 @@ class InteractiveQuestionnaire:
             default=False
         )
 
-    def gather_evidence_details(self) -> Dict:
+    def gather_evidence_details(self) -> Mapping:
         """Gather information about available evidence."""
-        print("\n" + "="*60)
-        print("AVAILABLE EVIDENCE")
-        print("="*60)
-
-        print("\nWhat evidence do you have? (This helps strengthen your appeal)")
+        _emit(_HDR_EVIDENCE, "\nWhat evidence do you have? (This helps strengthen your appeal)")
 
         evidence_types = [
             "Photos of parking location and signage",
@@ -241,7 +268,10 @@ class InteractiveQuestionnaire:
 
             for evidence_type in selected:
                 key = evidence_type.lower().replace(" ", "_").replace("/", "_")
-                self.evidence[f"has_{key}"] = True
+                has_key = f"has_{key}"
+                if not self.evidence.get(has_key):
+                    self.evidence_count += 1
+                self.evidence[has_key] = True
 
                 # Ask for details
                 details = self.get_input(
@@ -259,30 +289,31 @@ class InteractiveQuestionnaire:
         if additional_info:
             self.citation_details['additional_info'] = additional_info
 
-        return self.evidence
+        return self._evidence_view
 
-    def identify_appeal_angles(self) -> List[str]:
+    def identify_appeal_angles(self) -> Sequence[str]:
         """Analyze gathered information to identify viable appeal angles."""
-        print("\n" + "="*60)
-        print("ANALYZING YOUR SITUATION...")
-        print("="*60)
-
         # Use the strategy analyzer to identify relevant angles
         suggested_angles = AppealStrategyAnalyzer.analyze_situation(self.citation_details)
 
-        print(f"\nBased on your situation, we've identified {len(suggested_angles)} potential appeal angles:")
+        lines = [
+            _HDR_ANALYZING,
+            f"\nBased on your situation, we've identified {len(suggested_angles)} potential appeal angles:",
+        ]
 
+        strengths = AppealStrategyAnalyzer.get_all_angle_strengths(self.evidence)
         angle_objects = []
         for angle_key in suggested_angles:
             angle = AppealStrategyAnalyzer.get_angle(angle_key)
             if angle:
                 angle_objects.append((angle_key, angle))
-                strength = AppealStrategyAnalyzer.get_angle_strength(angle_key, self.evidence)
-                print(f"\n  • {angle.name} ({strength.upper()} case)")
-                print(f"    {angle.description}")
+                strength = strengths[angle_key]
+                lines.append(f"\n  • {angle.name} ({strength.upper()} case)")
+                lines.append(f"    {angle.description}")
 
         # Let user select which angles to pursue
-        print("\n" + "-"*60)
+        lines.append(_SEPARATOR)
+        _emit(*lines)
         use_all = self.get_yes_no(
             "Would you like to pursue all suggested angles?",
             default=True
@@ -303,13 +334,18 @@ class InteractiveQuestionnaire:
             return [name_to_key[name] for name in selected_names if name in name_to_key]
 
     def run_full_questionnaire(self) -> Dict:
-        """Run the complete questionnaire and return all gathered information."""
-        print("\n" + "="*70)
-        print(" "*15 + "PARKING CITATION APPEAL ASSISTANT")
-        print("="*70)
-        print("\nThis tool will help you build a strong appeal for your parking citation.")
-        print("Please answer the following questions as accurately as possible.")
-        print("The more details you provide, the better we can help.")
+        """
+        Run the complete questionnaire and return all gathered information.
+
+        The citation details, location info and evidence are returned as read-only
+        views of the questionnaire's own dicts rather than copies.
+        """
+        _emit(
+            _HDR_WELCOME,
+            "\nThis tool will help you build a strong appeal for your parking citation.",
+            "Please answer the following questions as accurately as possible.",
+            "The more details you provide, the better we can help.",
+        )
 
         # Gather all information
         self.gather_basic_citation_info()
@@ -323,28 +359,40 @@ class InteractiveQuestionnaire:
 
         # Return everything
         return {
-            'citation_details': self.citation_details,
-            'location_info': self.location_info,
-            'evidence': self.evidence,
+            'citation_details': self._citation_details_view,
+            'location_info': self._location_info_view,
+            'evidence': self._evidence_view,
+            'evidence_count': self.evidence_count,
             'selected_angles': selected_angles,
         }
 
     def ask_follow_up_questions(self, questions: List[str]) -> Dict:
-        """Ask AI-generated follow-up questions."""
-        print("\n" + "="*60)
-        print("FOLLOW-UP QUESTIONS")
-        print("="*60)
-        print("\nTo strengthen your appeal, please answer these additional questions:")
-
-        additional_info = {}
-
-        for i, question in enumerate(questions, 1):
-            print(f"\n{i}. {question}")
-            answer = self.get_input("Your answer", required=False)
-            if answer:
-                additional_info[f"followup_q{i}"] = {
-                    'question': question,
-                    'answer': answer
-                }
-
-        return additional_info
+        """
+        Ask AI-generated follow-up questions.
+
+        All questions are shown up front and the answers are read one line each,
+        in order, so they can also be pasted in as a block. A line with just "-"
+        skips that question; a blank line (or end of input) skips the rest.
+        """
+        _emit(
+            _HDR_FOLLOW_UP,
+            "\nTo strengthen your appeal, please answer these additional questions:\n",
+            *(f"{i}. {question}" for i, question in enumerate(questions, 1)),
+            _FOLLOW_UP_HINT,
+        )
+
+        answers = []
+        for i in range(1, len(questions) + 1):
+            try:
+                answer = input(f"{i}> ").strip()
+            except EOFError:
+                break
+            if not answer:
+                break
+            answers.append(answer)
+
+        return {
+            f"followup_q{i}": {'question': question, 'answer': answer}
+            for i, (question, answer) in enumerate(zip(questions, answers), 1)
+            if answer != _SKIP_ANSWER
+        }
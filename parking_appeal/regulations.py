@@ -2,14 +2,122 @@
 City and state-specific parking regulations and common appeal grounds.
 """
 
-from typing import Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+
+
+def _index_cities_by_state(city_regulations: Dict) -> Dict[str, Tuple[str, ...]]:
+    """Group city names by their (upper-case) state code, keeping table order."""
+    index = {}
+    for city, info in city_regulations.items():
+        index.setdefault(info["state"].upper(), []).append(city)
+    return {state: tuple(cities) for state, cities in index.items()}
+
+
+def _build_city_trie(city_names) -> Dict:
+    """
+    Build a character trie over lower-cased city names.
+
+    Each node maps a character to its child node; the None key holds the names of
+    all cities at or below that node, in table order.
+    """
+    root = {None: []}
+    for name in city_names:
+        node = root
+        node[None].append(name)
+        for char in name.lower():
+            node = node.setdefault(char, {None: []})
+            node[None].append(name)
+    return root
+
+
+# Shortest partial city name get_city_info will resolve; shorter input such as
+# "S" is too ambiguous to pick a city's rules from, so it only gets suggestions
+# through find_cities_by_prefix.
+MIN_CITY_PREFIX_LENGTH = 4
+
+
+# State-specific regulations and common defenses, keyed by upper-case state code
+STATE_REGULATIONS: Mapping[str, Dict] = MappingProxyType({
+    "CA": {
+        "name": "California",
+        "statute_limitations_days": 21,
+        "common_defenses": [
+            "CVC 22507.8 - Disabled parking violations require proper investigation",
+            "CVC 40215 - Notice of parking violation must be securely attached",
+            "Signage must comply with Manual on Uniform Traffic Control Devices (MUTCD)",
+        ],
+        "appeal_address_format": "City parking authority or designated appeals board",
+    },
+    "NY": {
+        "name": "New York",
+        "statute_limitations_days": 30,
+        "common_defenses": [
+            "NYC Traffic Rules require clear and visible signage",
+            "Broken meters - proof required within 7 days",
+            "Emergency vehicles - documentation required",
+        ],
+        "appeal_address_format": "Department of Finance, Parking Violations Bureau",
+    },
+    "TX": {
+        "name": "Texas",
+        "statute_limitations_days": 21,
+        "common_defenses": [
+            "Transportation Code 681.0101 - Proper notice requirements",
+            "Sign visibility and compliance with state standards",
+            "Meter malfunction - immediate reporting helps case",
+        ],
+        "appeal_address_format": "Municipal court or designated hearing officer",
+    },
+    "FL": {
+        "name": "Florida",
+        "statute_limitations_days": 30,
+        "common_defenses": [
+            "F.S. 316.1967 - Parking regulations must be clearly posted",
+            "Meter violations - malfunction must be documented",
+            "Emergency circumstances with supporting documentation",
+        ],
+        "appeal_address_format": "City clerk or parking violations bureau",
+    },
+    "IL": {
+        "name": "Illinois",
+        "statute_limitations_days": 21,
+        "common_defenses": [
+            "Chicago Municipal Code - signage requirements",
+            "Meter payment issues - transaction records",
+            "Medical emergency documentation",
+        ],
+        "appeal_address_format": "Department of Administrative Hearings",
+    },
+})
+
+
+def _index_case_variants(table: Mapping[str, Dict]) -> Dict[str, Dict]:
+    """Key every upper/lower-case spelling of each two-letter code to its entry."""
+    index = {}
+    for code, info in table.items():
+        first, second = code
+        for a in (first.upper(), first.lower()):
+            for b in (second.upper(), second.lower()):
+                index[a + b] = info
+    return index
+
+
+# Every case spelling of each state code, so lookups need no upper() call
+_STATE_LOOKUP: Mapping[str, Dict] = MappingProxyType(_index_case_variants(STATE_REGULATIONS))
+
+
+def get_state_info(state_code: str) -> Optional[Dict]:
+    """Get regulation information for a specific state."""
+    return _STATE_LOOKUP.get(state_code)
 
 
 class RegulationDatabase:
     """Database of parking regulations by city and state."""
 
     # Common appeal grounds that apply across jurisdictions
-    COMMON_APPEAL_GROUNDS = [
+    COMMON_APPEAL_GROUNDS: Tuple[str, ...] = (
         "unclear_signage",
         "emergency_circumstances",
         "vehicle_malfunction",
@@ -25,61 +133,10 @@ class RegulationDatabase:
         "time_discrepancy",
         "zone_confusion",
         "disability_accommodation",
-    ]
-
-    # State-specific regulations and common defenses
-    STATE_REGULATIONS = {
-        "CA": {
-            "name": "California",
-            "statute_limitations_days": 21,
-            "common_defenses": [
-                "CVC 22507.8 - Disabled parking violations require proper investigation",
-                "CVC 40215 - Notice of parking violation must be securely attached",
-                "Signage must comply with Manual on Uniform Traffic Control Devices (MUTCD)",
-            ],
-            "appeal_address_format": "City parking authority or designated appeals board",
-        },
-        "NY": {
-            "name": "New York",
-            "statute_limitations_days": 30,
-            "common_defenses": [
-                "NYC Traffic Rules require clear and visible signage",
-                "Broken meters - proof required within 7 days",
-                "Emergency vehicles - documentation required",
-            ],
-            "appeal_address_format": "Department of Finance, Parking Violations Bureau",
-        },
-        "TX": {
-            "name": "Texas",
-            "statute_limitations_days": 21,
-            "common_defenses": [
-                "Transportation Code 681.0101 - Proper notice requirements",
-                "Sign visibility and compliance with state standards",
-                "Meter malfunction - immediate reporting helps case",
-            ],
-            "appeal_address_format": "Municipal court or designated hearing officer",
-        },
-        "FL": {
-            "name": "Florida",
-            "statute_limitations_days": 30,
-            "common_defenses": [
-                "F.S. 316.1967 - Parking regulations must be clearly posted",
-                "Meter violations - malfunction must be documented",
-                "Emergency circumstances with supporting documentation",
-            ],
-            "appeal_address_format": "City clerk or parking violations bureau",
-        },
-        "IL": {
-            "name": "Illinois",
-            "statute_limitations_days": 21,
-            "common_defenses": [
-                "Chicago Municipal Code - signage requirements",
-                "Meter payment issues - transaction records",
-                "Medical emergency documentation",
-            ],
-            "appeal_address_format": "Department of Administrative Hearings",
-        },
-    }
+    )
+    _COMMON_APPEAL_GROUNDS_SET = frozenset(COMMON_APPEAL_GROUNDS)
+
+    STATE_REGULATIONS = STATE_REGULATIONS  # also reachable through the class, as before
 
     # City-specific regulations (can override state defaults)
     CITY_REGULATIONS = {
@@ -145,19 +202,63 @@ class RegulationDatabase:
         },
     }
 
+    # Reverse index of CITY_REGULATIONS: state code -> city names
+    _CITIES_BY_STATE = _index_cities_by_state(CITY_REGULATIONS)
+
+    # Prefix trie over city names, for partial and case-insensitive lookups
+    _CITY_TRIE = _build_city_trie(CITY_REGULATIONS)
+
     @classmethod
-    def get_state_info(cls, state_code: str) -> Optional[Dict]:
-        """Get regulation information for a specific state."""
-        return cls.STATE_REGULATIONS.get(state_code.upper())
+    def is_common_appeal_ground(cls, ground: str) -> bool:
+        """Check whether a ground applies across all jurisdictions."""
+        return ground in cls._COMMON_APPEAL_GROUNDS_SET
+
+    get_state_info = staticmethod(get_state_info)
 
     @classmethod
     def get_city_info(cls, city_name: str) -> Optional[Dict]:
-        """Get regulation information for a specific city."""
-        return cls.CITY_REGULATIONS.get(city_name)
+        """
+        Get regulation information for a specific city.
+
+        Falls back to a case-insensitive prefix match ("san fran") when the name
+        isn't an exact match, as long as only one city matches and the prefix has
+        at least MIN_CITY_PREFIX_LENGTH characters or is the whole name.
+        """
+        info = cls.CITY_REGULATIONS.get(city_name)
+        if info is None and city_name:
+            prefix = city_name.strip().lower()
+            matches = cls.find_cities_by_prefix(prefix)
+            if len(matches) == 1 and (
+                len(prefix) >= MIN_CITY_PREFIX_LENGTH or prefix == matches[0].lower()
+            ):
+                info = cls.CITY_REGULATIONS[matches[0]]
+        return info
 
     @classmethod
-    def get_combined_info(cls, city_name: Optional[str], state_code: str) -> Dict:
-        """Get combined regulation info for city and state."""
+    def find_cities_by_prefix(cls, prefix: str) -> Tuple[str, ...]:
+        """Get the cities whose names start with prefix, ignoring case."""
+        node = cls._CITY_TRIE
+        for char in prefix.strip().lower():
+            node = node.get(char)
+            if node is None:
+                return ()
+        return tuple(node[None])
+
+    @classmethod
+    def get_combined_info(cls, city_name: Optional[str], state_code: str) -> Mapping:
+        """
+        Get combined regulation info for city and state.
+
+        The regulation data is fixed for the life of the process, so results are
+        cached and returned as read-only mappings shared between callers.
+        """
+        # Normalize first so "il"/"IL" and ""/None share one cache entry
+        return cls._get_combined_info_cached(city_name or None, state_code.upper())
+
+    @classmethod
+    @lru_cache(maxsize=128)
+    def _get_combined_info_cached(cls, city_name: Optional[str], state_code: str) -> Mapping:
+        """Build the combined info for a normalized (city, STATE) pair."""
         info = {
             "state": cls.get_state_info(state_code),
             "city": None,
@@ -166,21 +267,23 @@ class RegulationDatabase:
 
         if city_name:
             city_info = cls.get_city_info(city_name)
-            if city_info and city_info.get("state") == state_code.upper():
+            if city_info and city_info.get("state") == state_code:
                 info["city"] = city_info
 
-        return info
+        return MappingProxyType(info)
 
     @classmethod
-    def get_all_states(cls) -> List[str]:
-        """Get list of all supported states."""
-        return list(cls.STATE_REGULATIONS.keys())
+    @lru_cache(maxsize=None)
+    def get_all_states(cls) -> Tuple[str, ...]:
+        """
+        Get all supported state codes.
+
+        Cached like get_combined_info; call get_all_states.cache_clear() after
+        changing STATE_REGULATIONS.
+        """
+        return tuple(cls.STATE_REGULATIONS)
 
     @classmethod
-    def get_cities_for_state(cls, state_code: str) -> List[str]:
-        """Get list of cities for a specific state."""
-        state_code = state_code.upper()
-        return [
-            city for city, info in cls.CITY_REGULATIONS.items()
-            if info.get("state") == state_code
-        ]
+    def get_cities_for_state(cls, state_code: str) -> Tuple[str, ...]:
+        """Get the cities with detailed information for a specific state."""
+        return cls._CITIES_BY_STATE.get(state_code.upper(), ())
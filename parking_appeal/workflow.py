@@ -3,18 +3,60 @@ Main workflow orchestrator for the parking appeal application.
 """
 
 import os
+import sys
 from datetime import datetime
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Union
 from colorama import Fore, Style, init
 
 from .questionnaire import InteractiveQuestionnaire
-from .appeal_generator import AppealGenerator
+from .appeal_generator import AppealGenerator, _titleize
 from .appeal_strategies import AppealStrategyAnalyzer
 from .regulations import RegulationDatabase
 
 # Initialize colorama for cross-platform color support
 init(autoreset=True)
 
+# Separator lines used in console headers and saved appeal files
+_BAR = "=" * 70
+_SEP = _BAR + "\n"
+
+# Timestamp formats for saved file names and the "DATE:" footer line
+_FILENAME_TIME_FORMAT = "%Y%m%d_%H%M%S"
+_FOOTER_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Closing block of every saved appeal letter; format with date=...
+_APPEAL_FOOTER = "\n\n" + _SEP + "\nGENERATED BY: Parking Citation Appeal Assistant\nDATE: {date}\n"
+
+# Characters in angle names that can't appear in a file name
+_SLUG_TABLE = str.maketrans({" ": "_", "/": "_", "\\": "_"})
+
+
+@lru_cache(maxsize=64)
+def _angle_slug(angle_name: str) -> str:
+    """Turn an angle name such as 'Zone/Area Confusion' into 'zone_area_confusion'."""
+    return angle_name.lower().translate(_SLUG_TABLE)
+
+
+# Write buffer for saved files; large enough that a typical letter is one syscall
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+def _write_appeal(path: str, header: str, body: Union[str, Iterable[str]], footer: str = "") -> None:
+    """
+    Write header, body and footer to path without joining them first.
+
+    body may be the full text or an iterable of chunks, such as the generator
+    returned by AppealGenerator.stream_comprehensive_appeal.
+    """
+    with open(path, 'w', buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write(header)
+        if isinstance(body, str):
+            f.write(body)
+        else:
+            f.writelines(body)
+        f.write(footer)
+
 
 class AppealWorkflow:
     """Orchestrates the complete parking citation appeal process."""
@@ -32,9 +74,11 @@ class AppealWorkflow:
 
     def print_header(self, text: str, color=Fore.CYAN):
         """Print a formatted header."""
-        print(f"\n{color}{'='*70}")
-        print(f"{text.center(70)}")
-        print(f"{'='*70}{Style.RESET_ALL}\n")
+        # One write instead of three prints. With autoreset, the old prints reset
+        # the color after the top bar, so that reset is kept explicit here.
+        sys.stdout.write(
+            f"\n{color}{_BAR}{Style.RESET_ALL}\n{text.center(70)}\n{_BAR}{Style.RESET_ALL}\n\n"
+        )
 
     def print_success(self, text: str):
         """Print success message."""
@@ -69,41 +113,36 @@ class AppealWorkflow:
             self.print_header("STEP 2: AI ANALYSIS", Fore.MAGENTA)
             self.print_info("Analyzing your case with AI...")
 
-            analysis = self.generator.analyze_citation_strength(
+            # Analysis and follow-up questions come back from a single request
+            bundle = self.generator.generate_bundle(
                 self.all_data['citation_details'],
                 self.all_data['location_info']['regulations'],
-                self.all_data['evidence']
+                self.all_data['selected_angles'],
+                self.all_data['evidence'],
+                include_appeals=False,
             )
 
-            if analysis.get('success'):
-                print(f"\n{Fore.WHITE}{analysis['analysis']}{Style.RESET_ALL}")
-                self.all_data['ai_analysis'] = analysis['analysis']
+            if bundle.get('success'):
+                print(f"\n{Fore.WHITE}{bundle['analysis']}{Style.RESET_ALL}")
+                self.all_data['ai_analysis'] = bundle['analysis']
             else:
-                self.print_warning(f"Analysis unavailable: {analysis.get('error')}")
+                self.print_warning(f"Analysis unavailable: {bundle.get('error')}")
 
             # Step 3: Follow-up questions (optional)
             self.print_header("STEP 3: FOLLOW-UP QUESTIONS", Fore.YELLOW)
 
             if self.all_data['selected_angles']:
-                # Get first angle for follow-up
-                first_angle_key = self.all_data['selected_angles'][0]
-                first_angle = AppealStrategyAnalyzer.get_angle(first_angle_key)
-
                 ask_followup = self.questionnaire.get_yes_no(
                     "Would you like to answer AI-generated follow-up questions to strengthen your appeal?",
                     default=True
                 )
 
-                if ask_followup and first_angle:
-                    self.print_info("Generating intelligent follow-up questions...")
-                    questions = self.generator.suggest_follow_up_questions(
-                        self.all_data['citation_details'],
-                        first_angle
-                    )
+                if ask_followup:
+                    questions = bundle.get('follow_up_questions')
 
                     if questions:
                         additional_info = self.questionnaire.ask_follow_up_questions(questions)
-                        self.all_data['citation_details'].update(additional_info)
+                        self.questionnaire.citation_details.update(additional_info)
                         self.print_success("Follow-up questions completed!")
                     else:
                         self.print_warning("Could not generate follow-up questions.")
@@ -116,12 +155,13 @@ class AppealWorkflow:
                 default=True
             )
 
-            appeals = {}
-
             if generate_separate:
-                self.print_info(f"Generating {len(self.all_data['selected_angles'])} separate appeals...")
+                self.print_info(
+                    f"Generating {len(self.all_data['selected_angles'])} separate appeals "
+                    "and a comprehensive unified appeal..."
+                )
 
-                appeals['individual'] = self.generator.generate_multi_angle_appeal(
+                appeals = self.generator.generate_all_appeals(
                     self.all_data['citation_details'],
                     self.all_data['location_info']['regulations'],
                     self.all_data['selected_angles'],
@@ -129,16 +169,17 @@ class AppealWorkflow:
                 )
 
                 self.print_success(f"Generated {len(appeals['individual'])} individual appeals!")
+            else:
+                self.print_info("Generating comprehensive unified appeal...")
 
-            # Always generate comprehensive appeal
-            self.print_info("Generating comprehensive unified appeal...")
-
-            appeals['comprehensive'] = self.generator.generate_comprehensive_appeal(
-                self.all_data['citation_details'],
-                self.all_data['location_info']['regulations'],
-                self.all_data['selected_angles'],
-                self.all_data['evidence']
-            )
+                appeals = {
+                    'comprehensive': self.generator.generate_comprehensive_appeal(
+                        self.all_data['citation_details'],
+                        self.all_data['location_info']['regulations'],
+                        self.all_data['selected_angles'],
+                        self.all_data['evidence']
+                    )
+                }
 
             self.print_success("Comprehensive appeal generated!")
 
@@ -199,80 +240,79 @@ class AppealWorkflow:
 
         # Create filename based on citation number and date
         citation_num = self.all_data['citation_details'].get('citation_number', 'UNKNOWN')
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_filename = f"{citation_num}_{timestamp}"
+        now = datetime.now()
+        base_filename = f"{citation_num}_{now.strftime(_FILENAME_TIME_FORMAT)}"
+        footer = _APPEAL_FOOTER.format(date=now.strftime(_FOOTER_DATE_FORMAT))
 
         appeals = self.all_data.get('appeals', {})
 
         # Save comprehensive appeal
         if 'comprehensive' in appeals:
             filename = os.path.join(output_dir, f"{base_filename}_comprehensive.txt")
-            with open(filename, 'w') as f:
-                f.write("PARKING CITATION APPEAL\n")
-                f.write("="*70 + "\n\n")
-                f.write(appeals['comprehensive'])
-                f.write("\n\n" + "="*70 + "\n")
-                f.write("\nGENERATED BY: Parking Citation Appeal Assistant\n")
-                f.write(f"DATE: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            _write_appeal(
+                filename, f"PARKING CITATION APPEAL\n{_SEP}\n", appeals['comprehensive'], footer
+            )
 
             self.print_success(f"Comprehensive appeal saved to: {filename}")
 
         # Save individual appeals
         if 'individual' in appeals:
             for angle_name, appeal_text in appeals['individual'].items():
-                safe_angle_name = angle_name.lower().replace(" ", "_").replace("/", "_")
-                filename = os.path.join(output_dir, f"{base_filename}_{safe_angle_name}.txt")
+                filename = os.path.join(output_dir, f"{base_filename}_{_angle_slug(angle_name)}.txt")
 
-                with open(filename, 'w') as f:
-                    f.write(f"PARKING CITATION APPEAL - {angle_name}\n")
-                    f.write("="*70 + "\n\n")
-                    f.write(appeal_text)
-                    f.write("\n\n" + "="*70 + "\n")
-                    f.write("\nGENERATED BY: Parking Citation Appeal Assistant\n")
-                    f.write(f"DATE: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+                _write_appeal(
+                    filename, f"PARKING CITATION APPEAL - {angle_name}\n{_SEP}\n", appeal_text, footer
+                )
 
             self.print_success(f"Individual appeals saved to: {output_dir}/")
 
         # Save analysis if available
         if 'ai_analysis' in self.all_data:
             filename = os.path.join(output_dir, f"{base_filename}_analysis.txt")
-            with open(filename, 'w') as f:
-                f.write("AI CASE ANALYSIS\n")
-                f.write("="*70 + "\n\n")
-                f.write(self.all_data['ai_analysis'])
+            _write_appeal(filename, f"AI CASE ANALYSIS\n{_SEP}\n", self.all_data['ai_analysis'])
 
             self.print_success(f"Case analysis saved to: {filename}")
 
         # Save summary
         summary_file = os.path.join(output_dir, f"{base_filename}_summary.txt")
-        with open(summary_file, 'w') as f:
-            f.write("APPEAL SUMMARY\n")
-            f.write("="*70 + "\n\n")
-
-            f.write("CITATION DETAILS:\n")
-            for key, value in self.all_data['citation_details'].items():
-                if value and not key.startswith('followup'):
-                    f.write(f"  {key.replace('_', ' ').title()}: {value}\n")
-
-            f.write("\n\nSELECTED APPEAL ANGLES:\n")
-            for angle_key in self.all_data['selected_angles']:
-                angle = AppealStrategyAnalyzer.get_angle(angle_key)
-                if angle:
-                    f.write(f"  • {angle.name}\n")
-
-            f.write("\n\nEVIDENCE AVAILABLE:\n")
-            evidence_count = sum(1 for k, v in self.all_data['evidence'].items() if v and k.startswith('has_'))
-            f.write(f"  {evidence_count} types of evidence collected\n")
+        data = self.all_data
+        summary = ["APPEAL SUMMARY\n", _SEP, "\n", "CITATION DETAILS:\n"]
+        summary.extend([
+            f"  {_titleize(key)}: {value}\n"
+            for key, value in data['citation_details'].items()
+            if value and not key.startswith('followup')
+        ])
+
+        summary.append("\n\nSELECTED APPEAL ANGLES:\n")
+        get_angle = AppealStrategyAnalyzer.get_angle
+        summary.extend([
+            f"  • {angle.name}\n"
+            for angle in map(get_angle, data['selected_angles'])
+            if angle
+        ])
+
+        summary.append("\n\nEVIDENCE AVAILABLE:\n")
+        summary.append(f"  {data['evidence_count']} types of evidence collected\n")
+
+        with open(summary_file, 'w', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.writelines(summary)
 
         self.print_success(f"Summary saved to: {summary_file}")
 
         self.print_info(f"\nAll files saved in the '{output_dir}' directory")
 
-    def quick_appeal(self, citation_number: str, state: str, violation_type: str) -> str:
+    def quick_appeal(
+        self,
+        citation_number: str,
+        state: str,
+        violation_type: str,
+        stream: bool = False,
+    ) -> str:
         """
         Generate a quick basic appeal with minimal information.
 
-        Useful for testing or simple cases.
+        Useful for testing or simple cases. With stream=True the letter is
+        written to stdout as it is generated; the full text is returned either way.
         """
         citation_details = {
             'citation_number': citation_number,
@@ -280,16 +320,24 @@ class AppealWorkflow:
             'first_violation': True,
         }
 
+        # Cached and already shaped as {'state': ..., 'city': None, ...}
         location_info = RegulationDatabase.get_combined_info(None, state)
 
         # Use basic angles
         angles = ['procedural_error', 'first_time_leniency']
 
-        appeal = self.generator.generate_comprehensive_appeal(
-            citation_details,
-            {'state': location_info.get('state'), 'city': None},
-            angles,
-            {}
-        )
+        if not stream:
+            return self.generator.generate_comprehensive_appeal(
+                citation_details, location_info, angles, {}
+            )
+
+        chunks = []
+        for chunk in self.generator.stream_comprehensive_appeal(
+            citation_details, location_info, angles, {}
+        ):
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+            chunks.append(chunk)
+        sys.stdout.write("\n")
 
-        return appeal
+        return "".join(chunks)
@@ -6,8 +6,10 @@ For unit testing without API calls, mock the genai module.
 
 import unittest
 import os
-from unittest.mock import Mock, patch
-from parking_appeal.appeal_generator import AppealGenerator
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, Mock, patch
+from google.api_core import exceptions as api_exceptions
+from parking_appeal.appeal_generator import AppealGenerator, MAX_EVIDENCE_FIELDS, NO_ANGLES_MESSAGE
 from parking_appeal.appeal_strategies import AppealStrategyAnalyzer
 
 
@@ -30,6 +32,12 @@ class TestAppealGenerator(unittest.TestCase):
             if old_key:
                 os.environ['GOOGLE_GENERATIVE_AI_API_KEY'] = old_key
 
+    def test_model_shared_per_api_key(self):
+        """Test generators with the same API key reuse one model instance."""
+        first = AppealGenerator(api_key="test_key")
+        second = AppealGenerator(api_key="test_key")
+        self.assertIs(first.model, second.model)
+
     def test_format_dict(self):
         """Test dictionary formatting for prompts."""
         generator = AppealGenerator(api_key="test_key")
@@ -44,6 +52,30 @@ class TestAppealGenerator(unittest.TestCase):
         formatted = generator._format_dict({})
         self.assertEqual(formatted, "None provided")
 
+    def test_format_dict_keeps_all_fields_without_limit(self):
+        """Test citation-sized dicts are formatted without dropping fields."""
+        generator = AppealGenerator(api_key="test_key")
+        data = {f'field_{i}': 'value' for i in range(MAX_EVIDENCE_FIELDS + 5)}
+        data['followup_q1'] = 'Was the sign visible?'
+        formatted = generator._format_dict(data)
+        self.assertEqual(formatted.count('\n'), len(data))
+        self.assertIn('Was the sign visible?', formatted)
+
+    def test_format_dict_caps_fields_with_limit(self):
+        """Test only the first ``limit`` populated fields are included."""
+        generator = AppealGenerator(api_key="test_key")
+        data = {f'field_{i}': 'value' for i in range(MAX_EVIDENCE_FIELDS + 5)}
+        formatted = generator._format_dict(data, MAX_EVIDENCE_FIELDS)
+        self.assertEqual(formatted.count('\n'), MAX_EVIDENCE_FIELDS)
+
+    def test_format_dict_known_and_unknown_keys(self):
+        """Test precomputed labels match the generic titling for unknown keys."""
+        generator = AppealGenerator(api_key="test_key")
+        formatted = generator._format_dict(
+            {'statute_limitations_days': 21, 'brand_new_field': 'x'}
+        )
+        self.assertEqual(formatted, "- Statute Limitations Days: 21\n- Brand New Field: x\n")
+
     @patch('parking_appeal.appeal_generator.genai')
     def test_build_appeal_prompt(self, mock_genai):
         """Test appeal prompt building."""
@@ -71,6 +103,333 @@ class TestAppealGenerator(unittest.TestCase):
         self.assertIn("California", prompt)
         self.assertIn("Procedural Error", prompt)
 
+    def test_generate_multi_angle_appeal_concurrent(self):
+        """Test multi-angle generation issues one async call per angle."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content_async = AsyncMock(
+            return_value=Mock(text="Appeal text")
+        )
+
+        appeals = generator.generate_multi_angle_appeal(
+            {'citation_number': 'ABC123'},
+            {'state': None, 'city': None},
+            ['procedural_error', 'signage_issues', 'unknown_angle'],
+            {},
+        )
+
+        self.assertEqual(generator.model.generate_content_async.await_count, 2)
+        self.assertEqual(appeals, {
+            'Procedural Error': 'Appeal text',
+            'Inadequate or Confusing Signage': 'Appeal text',
+        })
+
+    def test_generate_multi_angle_appeal_isolates_failures(self):
+        """Test one failed angle does not abort the rest of the batch."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content_async = AsyncMock(
+            side_effect=[Mock(text="Appeal text"), RuntimeError("quota exceeded")]
+        )
+
+        appeals = generator.generate_multi_angle_appeal(
+            {'citation_number': 'ABC123'},
+            {'state': None, 'city': None},
+            ['procedural_error', 'signage_issues'],
+            {},
+        )
+
+        self.assertEqual(len(appeals), 2)
+        self.assertIn('Appeal text', appeals.values())
+        self.assertTrue(any('quota exceeded' in text for text in appeals.values()))
+
+    def test_generate_all_appeals(self):
+        """Test individual and comprehensive appeals are generated together."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content_async = AsyncMock(
+            return_value=Mock(text="Appeal text")
+        )
+
+        appeals = generator.generate_all_appeals(
+            {'citation_number': 'ABC123'},
+            {'state': None, 'city': None},
+            ['procedural_error'],
+            {},
+        )
+
+        self.assertEqual(appeals['individual'], {'Procedural Error': 'Appeal text'})
+        self.assertEqual(appeals['comprehensive'], 'Appeal text')
+        self.assertEqual(generator.model.generate_content_async.await_count, 2)
+
+    def test_generate_appeal_and_analysis(self):
+        """Test the appeal and the analysis are parsed from one JSON response."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content.return_value = Mock(
+            text='{"appeal": "Appeal text", "analysis": "Analysis text"}'
+        )
+
+        result = generator.generate_appeal_and_analysis(
+            {'citation_number': 'ABC123'},
+            {'state': None, 'city': None},
+            ['procedural_error'],
+            {},
+        )
+
+        self.assertEqual(result['appeal'], "Appeal text")
+        self.assertEqual(result['analysis'], {'success': True, 'analysis': "Analysis text"})
+        self.assertEqual(generator.model.generate_content.call_count, 1)
+
+    def test_generate_appeal_and_analysis_invalid_json(self):
+        """Test a malformed combined response is reported for both parts."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content.return_value = Mock(text="not json")
+
+        result = generator.generate_appeal_and_analysis(
+            {}, {'state': None}, ['procedural_error'], {}
+        )
+
+        self.assertTrue(result['appeal'].startswith("Error generating comprehensive appeal"))
+        self.assertFalse(result['analysis']['success'])
+
+    def test_invalid_json_is_not_cached(self):
+        """Test a truncated JSON reply is retried on the next call instead of cached."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content.side_effect = [
+            Mock(text='{"appeal": "x"'),
+            Mock(text='{"appeal": "Appeal text", "analysis": "Analysis text"}'),
+        ]
+        args = ({'citation_number': 'ABC123'}, {'state': None}, ['procedural_error'], {})
+
+        first = generator.generate_appeal_and_analysis(*args)
+        second = generator.generate_appeal_and_analysis(*args)
+
+        self.assertFalse(first['analysis']['success'])
+        self.assertEqual(second['appeal'], "Appeal text")
+        self.assertTrue(second['analysis']['success'])
+        self.assertEqual(generator.model.generate_content.call_count, 2)
+
+    def test_generate_appeal_without_analysis(self):
+        """Test include_analysis=False makes a single request."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content.return_value = Mock(text="Appeal text")
+
+        result = generator.generate_appeal_and_analysis(
+            {'citation_number': 'ABC123'}, {'state': None, 'city': None},
+            ['procedural_error'], {}, include_analysis=False,
+        )
+
+        self.assertEqual(result, {'appeal': "Appeal text", 'analysis': None})
+        self.assertEqual(generator.model.generate_content.call_count, 1)
+
+    def test_comprehensive_appeal_single_request(self):
+        """Test all angles go into one prompt rather than one request per angle."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content.return_value = Mock(text="Appeal text")
+
+        generator.generate_comprehensive_appeal(
+            {'citation_number': 'ABC123'},
+            {'state': None, 'city': None},
+            ['procedural_error', 'signage_issues', 'first_time_leniency'],
+            {},
+        )
+
+        self.assertEqual(generator.model.generate_content.call_count, 1)
+        prompt = generator.model.generate_content.call_args.args[0]
+        self.assertIn("Procedural Error", prompt)
+        self.assertIn("Inadequate or Confusing Signage", prompt)
+
+    def test_generate_batch(self):
+        """Test batch appeals come back in input order, skipping unknown angles."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+
+        async def echo(prompt):
+            return Mock(text="Letter for " + ("A1" if "A1" in prompt else "B2"))
+
+        generator.model.generate_content_async = AsyncMock(side_effect=echo)
+        location = {'state': None, 'city': None}
+
+        appeals = generator.generate_batch([
+            {'citation_details': {'citation_number': 'A1'}, 'location_info': location,
+             'selected_angles': ['procedural_error'], 'evidence': {}},
+            {'citation_details': {'citation_number': 'C3'}, 'location_info': location,
+             'selected_angles': ['unknown_angle'], 'evidence': {}},
+            {'citation_details': {'citation_number': 'B2'}, 'location_info': location,
+             'selected_angles': ['signage_issues'], 'evidence': {}},
+        ])
+
+        self.assertEqual(appeals, ["Letter for A1", NO_ANGLES_MESSAGE, "Letter for B2"])
+        self.assertEqual(generator.model.generate_content_async.await_count, 2)
+        self.assertEqual(generator.generate_batch([]), [])
+
+    def test_no_known_angles_skips_api(self):
+        """Test empty or unknown angle lists never reach the model."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        args = ({'citation_number': 'ABC123'}, {'state': None, 'city': None})
+
+        self.assertEqual(generator.generate_multi_angle_appeal(*args, [], {}), {})
+        self.assertEqual(
+            generator.generate_comprehensive_appeal(*args, ['unknown_angle'], {}),
+            NO_ANGLES_MESSAGE,
+        )
+        self.assertEqual(
+            generator.generate_all_appeals(*args, [], {}),
+            {'individual': {}, 'comprehensive': NO_ANGLES_MESSAGE},
+        )
+        generator.model.generate_content.assert_not_called()
+        generator.model.generate_content_async.assert_not_called()
+
+    @patch('parking_appeal.appeal_generator.RETRY_BASE_DELAY', 0)
+    def test_transient_errors_are_retried(self):
+        """Test rate-limit and server errors are retried before giving up."""
+        generator = AppealGenerator(api_key="test_key", cache=False)
+        generator.model = Mock()
+        generator.model.generate_content.side_effect = [
+            api_exceptions.ServiceUnavailable("busy"), Mock(text="Analysis text")
+        ]
+        generator.model.generate_content_async = AsyncMock(side_effect=[
+            api_exceptions.TooManyRequests("slow down"), Mock(text="Appeal text")
+        ])
+
+        analysis = generator.analyze_citation_strength({'citation_number': 'ABC123'}, {}, {})
+        appeals = generator.generate_multi_angle_appeal(
+            {'citation_number': 'ABC123'}, {'state': None, 'city': None},
+            ['procedural_error'], {},
+        )
+
+        self.assertEqual(analysis['analysis'], "Analysis text")
+        self.assertEqual(appeals, {'Procedural Error': 'Appeal text'})
+        self.assertEqual(generator.model.generate_content.call_count, 2)
+        self.assertEqual(generator.model.generate_content_async.await_count, 2)
+
+    def test_permanent_errors_are_not_retried(self):
+        """Test errors that are not transient fail on the first attempt."""
+        generator = AppealGenerator(api_key="test_key", cache=False)
+        generator.model = Mock()
+        generator.model.generate_content.side_effect = api_exceptions.InvalidArgument("bad")
+
+        analysis = generator.analyze_citation_strength({'citation_number': 'ABC123'}, {}, {})
+
+        self.assertFalse(analysis['success'])
+        self.assertEqual(generator.model.generate_content.call_count, 1)
+
+    def test_repeated_prompt_uses_cache(self):
+        """Test a repeated prompt is answered from the response cache."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content.return_value = Mock(text="Analysis text")
+
+        first = generator.analyze_citation_strength({'citation_number': 'ABC123'}, {}, {})
+        second = generator.analyze_citation_strength({'citation_number': 'ABC123'}, {}, {})
+
+        self.assertEqual(first, second)
+        self.assertEqual(generator.model.generate_content.call_count, 1)
+
+    @patch('parking_appeal.appeal_generator.RESPONSE_CACHE_SIZE', 8)
+    def test_cache_eviction_thread_safe(self):
+        """Test concurrent fills of the shared in-memory cache stay within its size."""
+        generator = AppealGenerator(api_key="test_key")
+
+        def fill(worker):
+            for i in range(500):
+                generator._cache_response(f"{worker}-{i}", "text")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(fill, range(8)))
+
+        self.assertLessEqual(len(generator._cache), 8)
+
+    def test_cache_disabled(self):
+        """Test every call reaches the model when caching is disabled."""
+        generator = AppealGenerator(api_key="test_key", cache=False)
+        generator.model = Mock()
+        generator.model.generate_content.return_value = Mock(text="Analysis text")
+
+        generator.analyze_citation_strength({'citation_number': 'ABC123'}, {}, {})
+        generator.analyze_citation_strength({'citation_number': 'ABC123'}, {}, {})
+
+        self.assertEqual(generator.model.generate_content.call_count, 2)
+
+    def test_stream_comprehensive_appeal(self):
+        """Test streamed appeal chunks add up to the full letter."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content.return_value = iter(
+            [Mock(text="Dear "), Mock(text="Sir or Madam")]
+        )
+        args = ({'citation_number': 'ABC123'}, {'state': None, 'city': None},
+                ['procedural_error'], {})
+
+        chunks = list(generator.stream_comprehensive_appeal(*args))
+
+        self.assertEqual(chunks, ["Dear ", "Sir or Madam"])
+        self.assertEqual(generator.generate_comprehensive_appeal(*args), "Dear Sir or Madam")
+        self.assertEqual(generator.model.generate_content.call_count, 1)
+
+    def test_suggest_follow_up_questions_parsing(self):
+        """Test questions are read from a JSON array and capped at five."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content.return_value = Mock(text=(
+            '["Was the meter working?", "Was the sign visible?", '
+            '"Did you get a receipt?", "Who issued the ticket?", '
+            '"Was the curb painted?", "Were you parked overnight?"]'
+        ))
+
+        questions = generator.suggest_follow_up_questions(
+            {'citation_number': 'ABC123'},
+            AppealStrategyAnalyzer.get_angle("procedural_error"),
+        )
+
+        self.assertEqual(questions, [
+            "Was the meter working?",
+            "Was the sign visible?",
+            "Did you get a receipt?",
+            "Who issued the ticket?",
+            "Was the curb painted?",
+        ])
+
+    def test_generate_bundle(self):
+        """Test analysis, questions and appeals are parsed from one JSON response."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content.return_value = Mock(text=(
+            '{"analysis": "Strong case", '
+            '"follow_up_questions": ["Q1", "Q2", "Q3", "Q4", "Q5", "Q6"], '
+            '"appeals": [{"angle": "Procedural Error", "appeal": "Dear Sir"}]}'
+        ))
+
+        bundle = generator.generate_bundle(
+            {'citation_number': 'ABC123'},
+            {'state': None, 'city': None},
+            ['procedural_error'],
+            {},
+        )
+
+        self.assertTrue(bundle['success'])
+        self.assertEqual(bundle['analysis'], "Strong case")
+        self.assertEqual(len(bundle['follow_up_questions']), 5)
+        self.assertEqual(bundle['appeals'], {'Procedural Error': 'Dear Sir'})
+        self.assertEqual(generator.model.generate_content.call_count, 1)
+
+    def test_generate_bundle_invalid_json(self):
+        """Test a malformed bundle response is reported as a failure."""
+        generator = AppealGenerator(api_key="test_key")
+        generator.model = Mock()
+        generator.model.generate_content.return_value = Mock(text="not json")
+
+        bundle = generator.generate_bundle({}, {'state': None}, ['procedural_error'], {})
+
+        self.assertFalse(bundle['success'])
+        self.assertIn('error', bundle)
+
 
 class TestAppealGeneratorIntegration(unittest.TestCase):
     """
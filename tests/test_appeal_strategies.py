@@ -3,6 +3,7 @@ Tests for the appeal strategies module.
 """
 
 import unittest
+from collections.abc import Mapping
 from parking_appeal.appeal_strategies import AppealStrategyAnalyzer, AppealAngle
 
 
@@ -12,7 +13,7 @@ class TestAppealStrategies(unittest.TestCase):
     def test_get_all_angles(self):
         """Test retrieving all appeal angles."""
         angles = AppealStrategyAnalyzer.get_all_angles()
-        self.assertIsInstance(angles, dict)
+        self.assertIsInstance(angles, Mapping)
         self.assertGreater(len(angles), 0)
 
     def test_get_specific_angle(self):
@@ -22,6 +23,13 @@ class TestAppealStrategies(unittest.TestCase):
         self.assertIsInstance(angle, AppealAngle)
         self.assertEqual(angle.name, "Procedural Error")
 
+    def test_get_angle_returns_shared_instance(self):
+        """Test lookups return the registry's instance rather than building a new one."""
+        angle = AppealStrategyAnalyzer.get_angle("procedural_error")
+        self.assertIs(angle, AppealStrategyAnalyzer.get_all_angles()["procedural_error"])
+        self.assertIs(angle, AppealStrategyAnalyzer.get_angle("procedural_error"))
+        self.assertIsNone(AppealStrategyAnalyzer.get_angle("unknown_angle"))
+
     def test_analyze_situation_procedural_error(self):
         """Test situation analysis identifies procedural errors."""
         citation_details = {
@@ -60,11 +68,24 @@ class TestAppealStrategies(unittest.TestCase):
         self.assertIn("signage_issues", angles)
         self.assertIn("first_time_leniency", angles)
 
+    def test_analyze_situation_no_duplicates(self):
+        """Test several triggers for one angle suggest it once, in registry order."""
+        citation_details = {
+            "timeline_conflicts": True,
+            "has_errors": True,
+            "missing_info": True,
+            "incorrect_vehicle_info": True,
+            "time_incorrect": True,
+        }
+        angles = AppealStrategyAnalyzer.analyze_situation(citation_details)
+        self.assertEqual(angles, ["procedural_error", "time_discrepancy"])
+
     def test_analyze_situation_default_angles(self):
         """Test default angles are provided when no specific indicators."""
         citation_details = {}
         angles = AppealStrategyAnalyzer.analyze_situation(citation_details)
         self.assertGreater(len(angles), 0)
+        self.assertIs(angles, AppealStrategyAnalyzer.analyze_situation({}))
 
     def test_get_angle_strength_strong(self):
         """Test angle strength evaluation - strong case."""
@@ -83,14 +104,49 @@ class TestAppealStrategies(unittest.TestCase):
         strength = AppealStrategyAnalyzer.get_angle_strength("signage_issues", evidence)
         self.assertEqual(strength, "weak")
 
+    def test_get_all_angle_strengths(self):
+        """Test all-angle strengths match per-angle evaluation."""
+        evidence = {
+            "photos_showing_parking_spot_and_nearby_signage": True,
+            "photos_of_any_obstructions_or_damaged_signs": True,
+            "timestamped_photos_or_videos": True,
+            "witness_statements": True,
+        }
+        strengths = AppealStrategyAnalyzer.get_all_angle_strengths(evidence)
+        self.assertEqual(set(strengths), set(AppealStrategyAnalyzer.get_all_angles()))
+        for angle_key, strength in strengths.items():
+            self.assertEqual(
+                strength, AppealStrategyAnalyzer.get_angle_strength(angle_key, evidence)
+            )
+        self.assertEqual(strengths["signage_issues"], "moderate")
+
     def test_appeal_angle_dataclass(self):
         """Test AppealAngle dataclass structure."""
         angle = AppealStrategyAnalyzer.get_angle("meter_malfunction")
         self.assertIsNotNone(angle.name)
         self.assertIsNotNone(angle.description)
-        self.assertIsInstance(angle.key_questions, list)
-        self.assertIsInstance(angle.strength_indicators, list)
-        self.assertIsInstance(angle.required_evidence, list)
+        self.assertIsInstance(angle.key_questions, tuple)
+        self.assertIsInstance(angle.strength_indicators, tuple)
+        self.assertIsInstance(angle.required_evidence, tuple)
+
+    def test_appeal_angle_is_frozen(self):
+        """Test AppealAngle instances are read-only and carry no __dict__."""
+        angle = AppealStrategyAnalyzer.get_angle("meter_malfunction")
+        with self.assertRaises(AttributeError):
+            angle.name = "Changed"
+        self.assertFalse(hasattr(angle, '__dict__'))
+
+    def test_appeal_angle_defaults_and_hashing(self):
+        """Test list fields default to empty tuples and angles can be cache keys."""
+        angle = AppealAngle(name="Custom", description="A custom angle")
+        self.assertEqual(angle.required_evidence, ())
+        self.assertEqual(angle.required_evidence_keys, ())
+        self.assertEqual(hash(angle), hash(AppealAngle(name="Custom", description="A custom angle")))
+
+    def test_appeal_angles_read_only(self):
+        """Test the angle registry cannot be modified."""
+        with self.assertRaises(TypeError):
+            AppealStrategyAnalyzer.get_all_angles()["new_angle"] = None
 
 
 if __name__ == '__main__':
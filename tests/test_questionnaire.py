@@ -0,0 +1,123 @@
+"""
+Tests for the interactive questionnaire module.
+"""
+
+import io
+import unittest
+from unittest.mock import patch
+from parking_appeal.questionnaire import InteractiveQuestionnaire
+
+
+class TestInteractiveQuestionnaire(unittest.TestCase):
+    """Test the InteractiveQuestionnaire class."""
+
+    def setUp(self):
+        """Set up a questionnaire with console output captured."""
+        self.questionnaire = InteractiveQuestionnaire()
+        stdout_patcher = patch('sys.stdout', new_callable=io.StringIO)
+        self.stdout = stdout_patcher.start()
+        self.addCleanup(stdout_patcher.stop)
+
+    def answer(self, *responses):
+        """Feed the given responses to input() in order."""
+        patcher = patch('builtins.input', side_effect=list(responses))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get_input_optional_and_default(self):
+        """Test empty answers fall back to the default or an empty string."""
+        self.answer("", "", "  value  ")
+        self.assertEqual(self.questionnaire.get_input("Fine", default=50), "50")
+        self.assertEqual(self.questionnaire.get_input("Notes", required=False), "")
+        self.assertEqual(self.questionnaire.get_input("Notes", required=False), "value")
+
+    def test_get_input_required_reprompts(self):
+        """Test a required field is asked again until answered."""
+        self.answer("", "  ", "ABC123")
+        self.assertEqual(self.questionnaire.get_input("Citation Number"), "ABC123")
+        self.assertEqual(self.stdout.getvalue().count("This field is required"), 2)
+
+    def test_select_from_list_single(self):
+        """Test selecting a single option by number."""
+        self.answer("2")
+        selected = self.questionnaire.select_from_list("Pick one:", ["A", "B", "C"])
+        self.assertEqual(selected, ["B"])
+        self.assertIn("  1. A\n  2. B\n  3. C\n", self.stdout.getvalue())
+
+    def test_select_from_list_multiple(self):
+        """Test selecting several options, ignoring out-of-range numbers."""
+        self.answer("1, 3,9")
+        selected = self.questionnaire.select_from_list(
+            "Pick some:", ["A", "B", "C"], allow_multiple=True
+        )
+        self.assertEqual(selected, ["A", "C"])
+
+    def test_select_from_list_all(self):
+        """Test 'all' selects every option when multiple selection is allowed."""
+        self.answer("ALL")
+        options = ["A", "B"]
+        self.assertEqual(
+            self.questionnaire.select_from_list("Pick:", options, allow_multiple=True),
+            options,
+        )
+
+    def test_select_from_list_reprompts_on_invalid_input(self):
+        """Test malformed and out-of-range answers are rejected until valid."""
+        self.answer("abc", "1,2", "0", "1")
+        selected = self.questionnaire.select_from_list("Pick one:", ["A", "B"])
+        self.assertEqual(selected, ["A"])
+        output = self.stdout.getvalue()
+        self.assertEqual(output.count("Invalid input"), 2)
+        self.assertEqual(output.count("Invalid selection"), 1)
+
+    def test_get_yes_no(self):
+        """Test yes/no answers, case-insensitively, with re-prompting."""
+        self.answer("YES", "n", "maybe", "y")
+        self.assertTrue(self.questionnaire.get_yes_no("Continue?"))
+        self.assertFalse(self.questionnaire.get_yes_no("Continue?"))
+        self.assertTrue(self.questionnaire.get_yes_no("Continue?"))
+        self.assertIn("Please enter 'y' for yes", self.stdout.getvalue())
+
+    def test_get_yes_no_default(self):
+        """Test an empty answer returns the default when one is given."""
+        self.answer("", "")
+        self.assertFalse(self.questionnaire.get_yes_no("Continue?", default=False))
+        self.assertTrue(self.questionnaire.get_yes_no("Continue?", default=True))
+
+    def test_gather_basic_citation_info_returns_read_only_view(self):
+        """Test gathered details are returned as a live, read-only view."""
+        self.answer("ABC123", "01/15/2024", "", "123 Main St", "expired meter", "")
+        details = self.questionnaire.gather_basic_citation_info()
+        self.assertEqual(details['citation_number'], "ABC123")
+        with self.assertRaises(TypeError):
+            details['citation_number'] = "XYZ"
+        self.questionnaire.citation_details['followup_q1'] = {'answer': 'yes'}
+        self.assertIn('followup_q1', details)
+
+    def test_ask_follow_up_questions(self):
+        """Test answers are matched to questions in order, honouring skips."""
+        self.answer("Yes, it was broken", "-", "About 5 minutes", "")
+        questions = ["Was the meter broken?", "Did you report it?", "How long?", "Who?"]
+        info = self.questionnaire.ask_follow_up_questions(questions)
+        self.assertEqual(info, {
+            'followup_q1': {'question': "Was the meter broken?", 'answer': "Yes, it was broken"},
+            'followup_q3': {'question': "How long?", 'answer': "About 5 minutes"},
+        })
+        self.assertIn("1. Was the meter broken?\n2. Did you report it?", self.stdout.getvalue())
+
+    def test_ask_follow_up_questions_end_of_input(self):
+        """Test running out of input keeps the answers given so far."""
+        self.answer("Only answer", EOFError)
+        info = self.questionnaire.ask_follow_up_questions(["Q1?", "Q2?"])
+        self.assertEqual(list(info), ['followup_q1'])
+
+    def test_gather_evidence_details_counts_evidence_types(self):
+        """Test each distinct evidence type selected is counted once."""
+        self.answer("y", "1,2,1", "", "", "", "")
+        evidence = self.questionnaire.gather_evidence_details()
+        self.assertEqual(self.questionnaire.evidence_count, 2)
+        self.assertEqual(sum(1 for key in evidence if key.startswith('has_')), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
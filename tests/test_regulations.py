@@ -3,6 +3,7 @@ Tests for the regulations module.
 """
 
 import unittest
+from parking_appeal import regulations
 from parking_appeal.regulations import RegulationDatabase
 
 
@@ -22,6 +23,16 @@ class TestRegulationDatabase(unittest.TestCase):
         ca_upper = RegulationDatabase.get_state_info("CA")
         self.assertEqual(ca_lower, ca_upper)
 
+    def test_module_level_get_state_info(self):
+        """Test the module-level lookup matches the class method and is read-only."""
+        self.assertIs(regulations.get_state_info("tx"), RegulationDatabase.get_state_info("TX"))
+        self.assertIsNone(regulations.get_state_info("ZZ"))
+        for code in ("ca", "Ca", "cA", "CA"):
+            self.assertIs(regulations.get_state_info(code), regulations.STATE_REGULATIONS["CA"])
+        self.assertIsNone(regulations.get_state_info("CAL"))
+        with self.assertRaises(TypeError):
+            regulations.STATE_REGULATIONS["ZZ"] = {}
+
     def test_get_city_info(self):
         """Test retrieving city information."""
         sf_info = RegulationDatabase.get_city_info("San Francisco")
@@ -29,6 +40,30 @@ class TestRegulationDatabase(unittest.TestCase):
         self.assertEqual(sf_info['state'], "CA")
         self.assertIn('specific_rules', sf_info)
 
+    def test_find_cities_by_prefix(self):
+        """Test prefix search is case-insensitive and ignores surrounding spaces."""
+        self.assertEqual(RegulationDatabase.find_cities_by_prefix(" san F"), ("San Francisco",))
+        self.assertEqual(RegulationDatabase.find_cities_by_prefix("Boston"), ())
+        self.assertEqual(
+            len(RegulationDatabase.find_cities_by_prefix("")),
+            len(RegulationDatabase.CITY_REGULATIONS),
+        )
+
+    def test_get_city_info_prefix_fallback(self):
+        """Test a unique partial or mis-cased city name still resolves."""
+        la_info = RegulationDatabase.get_city_info("los ang")
+        self.assertIsNotNone(la_info)
+        self.assertEqual(la_info['state'], "CA")
+        self.assertIsNone(RegulationDatabase.get_city_info("Boston"))
+
+    def test_get_city_info_short_prefix_not_resolved(self):
+        """Test one- and two-letter input doesn't silently pick a city."""
+        for prefix in ("s", "l", "M", "C", "Sa", "ch"):
+            with self.subTest(prefix=prefix):
+                self.assertIsNone(RegulationDatabase.get_city_info(prefix))
+        self.assertEqual(RegulationDatabase.find_cities_by_prefix("M"), ("Miami",))
+        self.assertIsNotNone(RegulationDatabase.get_city_info("miami"))
+
     def test_get_combined_info(self):
         """Test getting combined city and state info."""
         info = RegulationDatabase.get_combined_info("San Francisco", "CA")
@@ -42,28 +77,60 @@ class TestRegulationDatabase(unittest.TestCase):
         self.assertIsNotNone(info['state'])
         self.assertIsNone(info['city'])
 
+    def test_get_combined_info_is_cached_and_read_only(self):
+        """Test combined info is reused across calls and cannot be mutated."""
+        first = RegulationDatabase.get_combined_info("Chicago", "IL")
+        second = RegulationDatabase.get_combined_info("Chicago", "IL")
+        self.assertIs(first, second)
+        with self.assertRaises(TypeError):
+            first['city'] = None
+
+    def test_get_combined_info_normalizes_cache_key(self):
+        """Test state case and empty city names share one cached result."""
+        self.assertIs(
+            RegulationDatabase.get_combined_info("Chicago", "il"),
+            RegulationDatabase.get_combined_info("Chicago", "IL"),
+        )
+        self.assertIs(
+            RegulationDatabase.get_combined_info("", "CA"),
+            RegulationDatabase.get_combined_info(None, "CA"),
+        )
+
     def test_get_all_states(self):
         """Test getting all supported states."""
         states = RegulationDatabase.get_all_states()
-        self.assertIsInstance(states, list)
+        self.assertIsInstance(states, tuple)
         self.assertIn("CA", states)
         self.assertIn("NY", states)
 
     def test_get_cities_for_state(self):
         """Test getting cities for a specific state."""
         ca_cities = RegulationDatabase.get_cities_for_state("CA")
-        self.assertIsInstance(ca_cities, list)
+        self.assertIsInstance(ca_cities, tuple)
         self.assertIn("San Francisco", ca_cities)
         self.assertIn("Los Angeles", ca_cities)
 
+    def test_state_and_city_lists_are_cached(self):
+        """Test repeated state and city lookups return the same object."""
+        self.assertIs(RegulationDatabase.get_all_states(), RegulationDatabase.get_all_states())
+        self.assertIs(
+            RegulationDatabase.get_cities_for_state("CA"),
+            RegulationDatabase.get_cities_for_state("CA"),
+        )
+
     def test_common_appeal_grounds(self):
         """Test common appeal grounds are defined."""
         grounds = RegulationDatabase.COMMON_APPEAL_GROUNDS
-        self.assertIsInstance(grounds, list)
+        self.assertIsInstance(grounds, tuple)
         self.assertGreater(len(grounds), 0)
         self.assertIn("unclear_signage", grounds)
         self.assertIn("emergency_circumstances", grounds)
 
+    def test_is_common_appeal_ground(self):
+        """Test membership checks against the common appeal grounds."""
+        self.assertTrue(RegulationDatabase.is_common_appeal_ground("unclear_signage"))
+        self.assertFalse(RegulationDatabase.is_common_appeal_ground("not_a_ground"))
+
 
 if __name__ == '__main__':
     unittest.main()
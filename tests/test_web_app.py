@@ -0,0 +1,333 @@
+"""
+Tests for the Flask web application.
+The generator is mocked, so no API calls are made.
+"""
+
+import json
+import os
+import sys
+import threading
+import unittest
+from concurrent.futures import Future
+from unittest.mock import patch
+
+try:
+    import flask  # noqa: F401
+except ImportError:  # the web app is optional
+    flask = None
+
+WEB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'web')
+
+
+def _load_app():
+    """Import web/app.py as a module."""
+    if WEB_DIR not in sys.path:
+        sys.path.insert(0, WEB_DIR)
+    import app
+    return app
+
+
+@unittest.skipUnless(flask, "Flask is not installed")
+class TestWebApp(unittest.TestCase):
+    """Test the web API endpoints."""
+
+    def setUp(self):
+        """Set up a test client."""
+        self.web = _load_app()
+        self.client = self.web.app.test_client()
+        # A fresh appeal cache per test, so responses don't leak between tests
+        cache_patch = patch.object(self.web, '_appeal_cache', self.web._TTLCache(8))
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+        key_patch = patch.object(self.web, 'API_KEY', 'test_key')
+        key_patch.start()
+        self.addCleanup(key_patch.stop)
+
+    def test_pages_rendered_once_per_script_root(self):
+        """Test static pages are cached, with URLs matching the mount point."""
+        with patch.object(self.web, 'render_template', wraps=self.web.render_template) as render:
+            self.web._rendered_page.cache_clear()
+            for _ in range(2):
+                self.assertEqual(self.client.get('/about').status_code, 200)
+            mounted = self.client.get('/about', environ_overrides={'SCRIPT_NAME': '/appeals'})
+        self.assertEqual(render.call_count, 2)
+        self.assertIn('/appeals/static/css/style.css', mounted.get_data(as_text=True))
+
+    def test_states(self):
+        """Test the states list and its ETag revalidation."""
+        response = self.client.get('/api/states')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['CA'], {'code': 'CA', 'name': 'California'})
+
+        etag = response.headers['ETag']
+        cached = self.client.get('/api/states', headers={'If-None-Match': etag})
+        self.assertEqual(cached.status_code, 304)
+
+    def test_cities(self):
+        """Test city lookups are case-insensitive and unknown states return no cities."""
+        self.assertEqual(
+            self.client.get('/api/cities/ca').get_json(),
+            self.client.get('/api/cities/CA').get_json(),
+        )
+        self.assertIn('San Francisco', self.client.get('/api/cities/CA').get_json())
+        self.assertEqual(self.client.get('/api/cities/ZZ').get_json(), [])
+
+    def test_appeal_angles(self):
+        """Test every angle is listed with its key, name and description."""
+        response = self.client.get('/api/appeal-angles')
+        angles = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response.headers)
+        self.assertIn(
+            {'key': 'procedural_error', 'name': 'Procedural Error',
+             'description': self.web.AppealStrategyAnalyzer.get_angle('procedural_error').description},
+            angles,
+        )
+
+    def test_analyze(self):
+        """Test suggested angles come back with their details and first questions."""
+        response = self.client.post('/api/analyze', json={'unclear_signage': True})
+        body = response.get_json()
+        self.assertTrue(body['success'])
+        signage = next(a for a in body['suggested_angles'] if a['key'] == 'signage_issues')
+        self.assertEqual(signage['name'], 'Inadequate or Confusing Signage')
+        self.assertEqual(len(signage['questions']), 3)
+
+    def test_background_appeal(self):
+        """Test a submitted appeal can be polled until its result is ready."""
+        with patch.object(
+            self.web.AppealGenerator, 'generate_appeal_and_analysis',
+            return_value={'appeal': 'Appeal text', 'analysis': None},
+        ):
+            submitted = self.client.post('/api/generate-appeal/async', json={
+                'state': 'CA',
+                'selected_angles': ['procedural_error'],
+            })
+            self.assertEqual(submitted.status_code, 202)
+            task_id = submitted.get_json()['task_id']
+            self.web._appeal_tasks.get(task_id).result(timeout=5)
+
+        status = self.client.get(submitted.get_json()['status_url']).get_json()
+        self.assertEqual(status['status'], 'done')
+        self.assertEqual(status['result']['appeal'], 'Appeal text')
+        self.assertEqual(status['result']['angles_used'], ['Procedural Error'])
+
+    def test_background_appeal_rejected_when_full(self):
+        """Test submissions beyond the in-flight limit get a 503 until a slot frees up."""
+        release = threading.Event()
+
+        def slow_generate(*args, **kwargs):
+            release.wait(timeout=5)
+            return {'appeal': 'Appeal text', 'analysis': None}
+
+        body = {'state': 'CA', 'selected_angles': ['procedural_error']}
+        with patch.object(self.web, '_task_slots', threading.BoundedSemaphore(1)), \
+                patch.object(self.web.AppealGenerator, 'generate_appeal_and_analysis',
+                             side_effect=slow_generate):
+            first = self.client.post('/api/generate-appeal/async', json=body)
+            rejected = self.client.post('/api/generate-appeal/async', json=body)
+            release.set()
+            self.web._appeal_tasks.get(first.get_json()['task_id']).result(timeout=5)
+            accepted = self.client.post('/api/generate-appeal/async', json=body)
+            self.web._appeal_tasks.get(accepted.get_json()['task_id']).result(timeout=5)
+
+        self.assertEqual(first.status_code, 202)
+        self.assertEqual(rejected.status_code, 503)
+        self.assertIn('Retry-After', rejected.headers)
+        self.assertEqual(accepted.status_code, 202)
+
+    def test_pending_tasks_not_evicted(self):
+        """Test a full task cache evicts finished tasks but keeps unfinished ones."""
+        tasks = self.web._TTLCache(2, can_evict=lambda future: future.done())
+        pending, finished = Future(), Future()
+        finished.set_result('{}')
+        tasks.setex('pending', 60, pending)
+        tasks.setex('finished', 60, finished)
+        tasks.setex('new', 60, Future())
+
+        self.assertIs(tasks.get('pending'), pending)
+        self.assertIsNone(tasks.get('finished'))
+        self.assertIsNotNone(tasks.get('new'))
+
+    def test_missing_api_key(self):
+        """Test API-backed endpoints return 503 when no key was configured at startup."""
+        with patch.object(self.web, 'API_KEY', None):
+            for url in ('/api/generate-appeal', '/api/generate-appeal/async',
+                        '/api/generate-appeal/stream'):
+                with self.subTest(url=url):
+                    response = self.client.post(url, json={'state': 'CA'})
+                    self.assertEqual(response.status_code, 503)
+            self.assertEqual(self.client.get('/api/states').status_code, 200)
+
+    def test_generate_appeals_batch(self):
+        """Test a batch returns one result per citation, in order."""
+        with patch.object(
+            self.web.AppealGenerator, 'generate_batch',
+            side_effect=lambda cases: [f"Letter {i}" for i in range(len(cases))],
+        ) as generate:
+            response = self.client.post('/api/generate-appeals-batch', json={'citations': [
+                {'state': 'CA', 'selected_angles': ['procedural_error']},
+                {'state': 'NY', 'selected_angles': ['signage_issues']},
+            ]})
+
+        body = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(generate.call_count, 1)
+        self.assertEqual(body['results'], [
+            {'appeal': 'Letter 0', 'angles_used': ['Procedural Error']},
+            {'appeal': 'Letter 1', 'angles_used': ['Inadequate or Confusing Signage']},
+        ])
+
+    def test_generate_appeals_batch_invalid(self):
+        """Test an invalid entry or an oversized batch is rejected."""
+        response = self.client.post('/api/generate-appeals-batch', json={'citations': [
+            {'state': 'CA'}, {'citation_number': 'ABC123'},
+        ]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("citations[1]", response.get_json()['error'])
+
+        response = self.client.post('/api/generate-appeals-batch', json={
+            'citations': [{'state': 'CA'}] * (self.web.MAX_BATCH_SIZE + 1)
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def test_background_appeal_unknown_task(self):
+        """Test polling an unknown task id returns 404."""
+        self.assertEqual(self.client.get('/api/appeal-status/nope').status_code, 404)
+
+    def test_invalid_request_bodies_rejected(self):
+        """Test malformed bodies get a 400 before reaching the generator."""
+        with patch.object(self.web.AppealGenerator, 'generate_appeal_and_analysis') as generate:
+            cases = [
+                ('/api/analyze', None, "JSON object"),
+                ('/api/analyze', {'unclear_signage': 'yes'}, "'unclear_signage' must be true or false"),
+                ('/api/generate-appeal', {'citation_number': 'ABC123'}, "'state' is required"),
+                ('/api/generate-appeal', {'state': 'CA', 'evidence': [1]}, "'evidence' must be a list"),
+                ('/api/generate-appeal/stream', ['not', 'an', 'object'], "JSON object"),
+            ]
+            for url, payload, message in cases:
+                with self.subTest(url=url, payload=payload):
+                    response = self.client.post(url, json=payload)
+                    self.assertEqual(response.status_code, 400)
+                    self.assertFalse(response.get_json()['success'])
+                    self.assertIn(message, response.get_json()['error'])
+        generate.assert_not_called()
+
+    def test_analyze_without_flags(self):
+        """Test a payload with no situation flags gets the analyzer's default angles."""
+        response = self.client.post('/api/analyze', json={'violation_type': 'expired meter'})
+        keys = [angle['key'] for angle in response.get_json()['suggested_angles']]
+        self.assertEqual(
+            keys, list(self.web.AppealStrategyAnalyzer.analyze_situation({'violation_type': 'x'}))
+        )
+
+    def test_generate_appeal(self):
+        """Test the appeal and analysis come back from one generator call."""
+        with patch.object(
+            self.web.AppealGenerator, 'generate_appeal_and_analysis',
+            return_value={
+                'appeal': 'Appeal text',
+                'analysis': {'success': True, 'analysis': 'Analysis text'},
+            },
+        ) as generate:
+            response = self.client.post('/api/generate-appeal', json={
+                'citation_number': 'ABC123',
+                'state': 'CA',
+                'selected_angles': ['procedural_error', 'unknown_angle'],
+            })
+
+        body = response.get_json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body['appeal'], 'Appeal text')
+        self.assertEqual(body['analysis'], 'Analysis text')
+        self.assertEqual(body['angles_used'], ['Procedural Error'])
+        self.assertEqual(generate.call_count, 1)
+        self.assertTrue(generate.call_args.kwargs['include_analysis'])
+
+    def test_generate_appeal_cached(self):
+        """Test a repeated request is answered from the appeal cache."""
+        payload = {'citation_number': 'CACHE1', 'state': 'CA',
+                   'selected_angles': ['procedural_error']}
+        with patch.object(
+            self.web.AppealGenerator, 'generate_appeal_and_analysis',
+            return_value={'appeal': 'Appeal text', 'analysis': None},
+        ) as generate:
+            first = self.client.post('/api/generate-appeal', json=payload).get_json()
+            second = self.client.post('/api/generate-appeal', json=payload).get_json()
+            self.client.post('/api/generate-appeal', json={**payload, 'citation_number': 'CACHE2'})
+
+        self.assertEqual(first, second)
+        self.assertEqual(generate.call_count, 2)
+
+    def test_generate_appeal_failure_not_cached(self):
+        """Test failed generations are retried rather than served from the cache."""
+        payload = {'citation_number': 'FAIL1', 'state': 'CA',
+                   'selected_angles': ['procedural_error']}
+        with patch.object(
+            self.web.AppealGenerator, 'generate_appeal_and_analysis',
+            return_value={
+                'appeal': 'Error generating comprehensive appeal: quota',
+                'analysis': {'success': False, 'error': 'quota'},
+            },
+        ) as generate:
+            self.client.post('/api/generate-appeal', json=payload)
+            self.client.post('/api/generate-appeal', json=payload)
+
+        self.assertEqual(generate.call_count, 2)
+
+    def test_generate_appeal_evidence_keys(self):
+        """Test form and free-form evidence labels become has_* keys."""
+        with patch.object(
+            self.web.AppealGenerator, 'generate_appeal_and_analysis',
+            return_value={'appeal': 'Appeal text', 'analysis': None},
+        ) as generate:
+            self.client.post('/api/generate-appeal', json={
+                'state': 'CA',
+                'selected_angles': ['procedural_error'],
+                'evidence': ['parking_receipt', 'Police Report'],
+            })
+
+        self.assertEqual(
+            generate.call_args.args[3],
+            {'has_parking_receipt': True, 'has_police_report': True},
+        )
+
+    def test_stream_appeal(self):
+        """Test the letter is sent as SSE chunks followed by a done event."""
+        with patch.object(
+            self.web.AppealGenerator, 'stream_comprehensive_appeal',
+            return_value=iter(['Dear ', 'Sir']),
+        ):
+            response = self.client.post('/api/generate-appeal/stream', json={
+                'state': 'CA',
+                'selected_angles': ['procedural_error'],
+            })
+
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        messages = response.get_data(as_text=True).split('\n\n')
+        self.assertEqual(messages[-1], '')
+        self.assertEqual(
+            [json.loads(message.rpartition('data: ')[2]) for message in messages[:-1]],
+            [{'chunk': 'Dear '}, {'chunk': 'Sir'}, {'angles_used': ['Procedural Error']}],
+        )
+        self.assertTrue(messages[2].startswith('event: done\n'))
+
+    def test_json_provider(self):
+        """Test orjson handles API JSON when it is installed."""
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            self.skipTest("orjson is not installed")
+        self.assertIsInstance(self.web.app.json, self.web.OrjsonProvider)
+        self.assertEqual(self.web.app.json.dumps({'b': (1, 2), 'a': 'é'}), '{"a":"é","b":[1,2]}')
+        self.assertEqual(self.web.app.json.loads(b'{"a": [1]}'), {'a': [1]})
+
+    def test_generator_shared_between_requests(self):
+        """Test one generator is reused per API key."""
+        first = self.web.get_generator('test_key')
+        self.assertIs(self.web.get_generator('test_key'), first)
+        self.assertIsNot(self.web.get_generator('other_key'), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
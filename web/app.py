@@ -2,11 +2,36 @@
 Flask web application for the Parking Citation Appeal Assistant.
 """
 
+import hashlib
+import json
 import os
-from flask import Flask, render_template, request, jsonify, session
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from flask import (
+    Flask, Response, render_template, request, jsonify, session, stream_with_context, url_for
+)
+from flask.json.provider import DefaultJSONProvider
 from dotenv import load_dotenv
 import sys
 
+try:
+    import orjson
+except ImportError:  # optional, faster JSON encoding and decoding for the API
+    orjson = None
+try:
+    from flask_compress import Compress
+except ImportError:  # optional, compresses large responses such as generated appeals
+    Compress = None
+
+try:
+    import redis
+except ImportError:  # optional, only needed to share cached appeals between processes
+    redis = None
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -17,84 +42,423 @@ from parking_appeal.appeal_strategies import AppealStrategyAnalyzer
 # Load environment variables
 load_dotenv()
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    Used for jsonify, request.get_json and app.json when orjson is installed.
+    Keys are sorted as with Flask's default provider; output is always compact
+    except in debug mode.
+    """
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize obj to a JSON string."""
+        option = orjson.OPT_SORT_KEYS if self.sort_keys else 0
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes."""
+        return orjson.loads(s)
+
+
+# Read once at startup; restart the server after changing them
+API_KEY = os.getenv('GOOGLE_GENERATIVE_AI_API_KEY')
+
 app = Flask(__name__)
-app.secret_key = os.urandom(24)
+app.secret_key = os.getenv('SECRET_KEY') or os.urandom(24)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Brotli (or gzip for older clients) for responses of 1 KiB or more, such as a
+# generated appeal with its analysis. Streamed responses are left alone: the
+# compressor would buffer the whole stream and defeat the SSE endpoint.
+app.config.update(
+    COMPRESS_ALGORITHM=['br', 'gzip'],
+    COMPRESS_MIN_SIZE=1024,
+    COMPRESS_STREAMS=False,
+)
+if Compress is not None:
+    Compress(app)
+
+# Views that call the Gemini API, and so can't work without API_KEY
+_API_ENDPOINTS = frozenset({
+    'generate_appeal', 'generate_appeals_batch', 'submit_appeal', 'stream_appeal'
+})
+
+
+@app.before_request
+def _require_api_key():
+    """Answer API-backed endpoints with 503 when no API key is configured."""
+    if not API_KEY and request.endpoint in _API_ENDPOINTS:
+        return jsonify({
+            'success': False,
+            'error': 'API key not configured'
+        }), 503
+
+
+# One generator per process, shared by all requests so its response cache and
+# the SDK client it wraps are reused rather than rebuilt on every POST.
+_generator: Optional[AppealGenerator] = None
+_generator_lock = threading.Lock()
+
+
+def get_generator(api_key: str) -> AppealGenerator:
+    """Get the shared AppealGenerator, creating it on first use or when the key changes."""
+    global _generator
+    generator = _generator
+    if generator is not None and generator.api_key == api_key:
+        return generator
+    with _generator_lock:
+        if _generator is None or _generator.api_key != api_key:
+            _generator = AppealGenerator(api_key=api_key)
+        return _generator
+
+
+# Finished /api/generate-appeal responses are kept this long (seconds), keyed by
+# a hash of the normalized request, so a repeated submission skips the API.
+APPEAL_CACHE_TTL = 24 * 60 * 60
+APPEAL_CACHE_SIZE = 256
+
+
+class _TTLCache:
+    """Bounded in-process TTL cache with the Redis get/setex interface."""
+
+    def __init__(self, maxsize: int, can_evict: Optional[Callable[[Any], bool]] = None):
+        """
+        Create an empty cache holding at most maxsize entries.
+
+        When can_evict is given, only values it accepts are evicted to make room;
+        if none qualify the cache grows past maxsize instead.
+        """
+        self._maxsize = maxsize
+        self._can_evict = can_evict
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """Get the value for key, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def setex(self, key: str, ttl: int, value: Any) -> None:
+        """Store value for ttl seconds, evicting the oldest entry when full."""
+        with self._lock:
+            if key not in self._entries and len(self._entries) >= self._maxsize:
+                self._evict_oldest()
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def _evict_oldest(self) -> None:
+        """Drop the oldest evictable entry; the caller holds the lock."""
+        for key, (_, value) in self._entries.items():
+            if self._can_evict is None or self._can_evict(value):
+                del self._entries[key]
+                return
+
+
+def _create_appeal_cache():
+    """Use Redis when REDIS_URL is set (and redis is installed), else an in-process cache."""
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url and redis is not None:
+        return redis.Redis.from_url(redis_url)
+    return _TTLCache(APPEAL_CACHE_SIZE)
+
+
+_appeal_cache = _create_appeal_cache()
+
+# Appeals submitted to /api/generate-appeal/async run on this pool, off the
+# request thread. Tasks live in this process, so with several gunicorn workers
+# a status poll must reach the worker that accepted the task (see README.md).
+APPEAL_TASK_WORKERS = 4
+APPEAL_TASK_TTL = 60 * 60
+APPEAL_TASK_LIMIT = 1024
+# Submissions beyond this many queued or running tasks are turned away with a
+# 503 rather than piling up behind the pool's unbounded queue.
+APPEAL_TASK_MAX_PENDING = APPEAL_TASK_WORKERS * 8
+
+_task_pool = ThreadPoolExecutor(max_workers=APPEAL_TASK_WORKERS, thread_name_prefix='appeal-task')
+_task_slots = threading.BoundedSemaphore(APPEAL_TASK_MAX_PENDING)
+# Unfinished tasks are never evicted, so a client can always poll its result.
+_appeal_tasks = _TTLCache(APPEAL_TASK_LIMIT, can_evict=lambda future: future.done())
+
+
+def _appeal_cache_key(*parts) -> str:
+    """Content hash of the normalized generator inputs."""
+    normalized = json.dumps(parts, sort_keys=True, default=str)
+    return "appeal:" + hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def _appeal_cache_get(key: str):
+    """Cached response body for key, or None (also when the cache is unreachable)."""
+    try:
+        return _appeal_cache.get(key)
+    except Exception:
+        return None
+
+
+def _appeal_cache_set(key: str, body: str) -> None:
+    """Store a response body; a cache outage must not fail the request."""
+    try:
+        _appeal_cache.setex(key, APPEAL_CACHE_TTL, body)
+    except Exception:
+        pass
+
+
+# Evidence checkbox values sent by the form (templates/form.html), mapped to
+# their evidence dict keys; other values are converted on the fly.
+_EVIDENCE_KEY = {
+    label: f'has_{label.lower().replace(" ", "_")}'
+    for label in (
+        'photos_of_parking_location_and_signage',
+        'photos_of_citation',
+        'parking_receipt',
+        'meter_photos',
+        'payment_records',
+        'medical_documentation',
+        'witness_statements',
+    )
+}
+
+
+class RequestValidationError(ValueError):
+    """A request body is not a JSON object, or a field is missing or mistyped."""
+
+
+# Field kinds for request bodies: accepted types and how to describe them in errors
+_TEXT = ((str,), "a string")
+_FLAG = ((bool,), "true or false")
+_AMOUNT = ((str, int, float), "a number or a string")
+_TEXT_LIST = ((list,), "a list of strings")
+
+# Marks a field without a default
+_REQUIRED = object()
+
+# Most citations accepted by one /api/generate-appeals-batch request
+MAX_BATCH_SIZE = 20
+
+# Request body schemas: field name -> (kind, default used when missing or null).
+# Citation fields are listed in the order they appear in the prompt.
+_ANALYZE_FIELDS = {
+    'citation_number': (_TEXT, None),
+    'violation_type': (_TEXT, None),
+    'unclear_signage': (_FLAG, False),
+    'meter_malfunction': (_FLAG, False),
+    'emergency_situation': (_FLAG, False),
+    'paid_for_parking': (_FLAG, False),
+    'paid_not_displayed': (_FLAG, False),
+    'first_violation': (_FLAG, False),
+    'time_incorrect': (_FLAG, False),
+    'has_disability_placard': (_FLAG, False),
+    'incorrect_vehicle_info': (_FLAG, False),
+}
+
+_CITATION_FIELDS = {
+    'citation_number': (_TEXT, None),
+    'citation_date': (_TEXT, None),
+    'citation_time': (_TEXT, None),
+    'location': (_TEXT, None),
+    'violation_type': (_TEXT, None),
+    'fine_amount': (_AMOUNT, None),
+    'first_violation': (_FLAG, False),
+    'unclear_signage': (_FLAG, False),
+    'meter_malfunction': (_FLAG, False),
+    'emergency_situation': (_FLAG, False),
+    'emergency_description': (_TEXT, None),
+    'paid_for_parking': (_FLAG, False),
+    'paid_not_displayed': (_FLAG, False),
+    'time_incorrect': (_FLAG, False),
+    'has_disability_placard': (_FLAG, False),
+    'additional_info': (_TEXT, None),
+}
+
+_APPEAL_FIELDS = {
+    **_CITATION_FIELDS,
+    'state': (_TEXT, _REQUIRED),
+    'city': (_TEXT, None),
+    'selected_angles': (_TEXT_LIST, None),
+    'evidence': (_TEXT_LIST, []),
+    'evidence_description': (_TEXT, None),
+    'include_analysis': (_FLAG, True),
+}
+
+_BATCH_FIELDS = {
+    'citations': (((list,), "a list of citation objects"), _REQUIRED),
+}
+
+
+def _parse_body(fields: Dict) -> Dict:
+    """
+    Read the request's JSON body and check it against a field schema.
+
+    Returns:
+        Dictionary with exactly the schema's fields, in schema order, with
+        defaults filled in
+
+    Raises:
+        RequestValidationError: If the body is not an object, or a field is
+            missing or has the wrong type
+    """
+    return _validate(request.get_json(silent=True), fields)
+
+
+def _validate(data, fields: Dict, context: Optional[str] = None) -> Dict:
+    """
+    Check one decoded JSON value against a field schema (see _parse_body).
+
+    context names the value in error messages when it is nested in the body,
+    e.g. "citations[2]".
+    """
+    if not isinstance(data, dict):
+        raise RequestValidationError(f"{context or 'Request body'} must be a JSON object")
+
+    prefix = f"{context}: " if context else ""
+    body = {}
+    for name, (kind, default) in fields.items():
+        value = data.get(name)
+        if value is None:
+            if default is _REQUIRED:
+                raise RequestValidationError(f"{prefix}'{name}' is required")
+            value = default
+        elif not isinstance(value, kind[0]) or (
+            kind is _TEXT_LIST and not all(isinstance(item, str) for item in value)
+        ):
+            raise RequestValidationError(f"{prefix}'{name}' must be {kind[1]}")
+        body[name] = value
+    return body
+
+
+def _bad_request(error: RequestValidationError):
+    """400 response for an invalid request body."""
+    return jsonify({
+        'success': False,
+        'error': str(error)
+    }), 400
+
+
+def _static_payload(data):
+    """Serialize data that never changes at runtime, with an ETag for its body."""
+    body = app.json.dumps(data)
+    return body, hashlib.blake2b(body.encode(), digest_size=16).hexdigest()
+
+
+def _static_json(payload) -> Response:
+    """Respond with a precomputed payload, or 304 if the client already has it."""
+    body, etag = payload
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+# The regulation and angle tables are fixed for the life of the process, so
+# these responses are serialized once at import instead of on every request.
+_STATES_PAYLOAD = _static_payload({
+    state_code: {
+        'code': state_code,
+        'name': RegulationDatabase.get_state_info(state_code)['name']
+    }
+    for state_code in RegulationDatabase.get_all_states()
+})
+
+_ANGLES_PAYLOAD = _static_payload([
+    {
+        'key': key,
+        'name': angle.name,
+        'description': angle.description
+    }
+    for key, angle in AppealStrategyAnalyzer.get_all_angles().items()
+])
+
+# Per-angle entries of the /api/analyze response, built once; they are only
+# ever serialized, never modified.
+_ANGLE_DETAILS = {
+    key: {
+        'key': key,
+        'name': angle.name,
+        'description': angle.description,
+        'questions': angle.key_questions[:3]
+    }
+    for key, angle in AppealStrategyAnalyzer.get_all_angles().items()
+}
+
+# Situation flags accepted by /api/analyze. With none of them set the analyzer
+# always suggests its default angles, so that response is serialized once here.
+_ANALYZE_FLAGS = tuple(name for name, (kind, _) in _ANALYZE_FIELDS.items() if kind is _FLAG)
+
+_DEFAULT_ANALYSIS_BODY = app.json.dumps({
+    'success': True,
+    'suggested_angles': [
+        _ANGLE_DETAILS[angle_key]
+        for angle_key in AppealStrategyAnalyzer.analyze_situation({})
+    ]
+})
+
+
+@lru_cache(maxsize=16)
+def _rendered_page(template: str, script_root: str) -> str:
+    """Render a page template; its only per-request input is the URL prefix."""
+    return render_template(template)
+
+
+def _page(template: str) -> str:
+    """Get a static page, rendered once per script root (every time in debug mode)."""
+    if app.debug:
+        return render_template(template)
+    return _rendered_page(template, request.script_root)
 
 
 @app.route('/')
 def index():
     """Landing page."""
-    return render_template('index.html')
+    return _page('index.html')
 
 
 @app.route('/api/states')
 def get_states():
     """Get list of supported states."""
-    states = RegulationDatabase.get_all_states()
-    state_info = {}
-    for state_code in states:
-        info = RegulationDatabase.get_state_info(state_code)
-        state_info[state_code] = {
-            'code': state_code,
-            'name': info['name']
-        }
-    return jsonify(state_info)
+    return _static_json(_STATES_PAYLOAD)
 
 
 @app.route('/api/cities/<state>')
 def get_cities(state):
     """Get cities for a specific state."""
-    cities = RegulationDatabase.get_cities_for_state(state)
-    return jsonify(cities)
+    return _static_json(_cities_payload(state.upper()))
+
+
+@lru_cache(maxsize=64)
+def _cities_payload(state_code: str):
+    """Serialized city list for an upper-case state code."""
+    return _static_payload(RegulationDatabase.get_cities_for_state(state_code))
 
 
 @app.route('/api/appeal-angles')
 def get_appeal_angles():
     """Get all available appeal angles."""
-    angles = AppealStrategyAnalyzer.get_all_angles()
-    angle_list = []
-    for key, angle in angles.items():
-        angle_list.append({
-            'key': key,
-            'name': angle.name,
-            'description': angle.description
-        })
-    return jsonify(angle_list)
+    return _static_json(_ANGLES_PAYLOAD)
 
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze_citation():
     """Analyze citation and suggest appeal angles."""
-    data = request.json
-
-    citation_details = {
-        'citation_number': data.get('citation_number'),
-        'violation_type': data.get('violation_type'),
-        'unclear_signage': data.get('unclear_signage', False),
-        'meter_malfunction': data.get('meter_malfunction', False),
-        'emergency_situation': data.get('emergency_situation', False),
-        'paid_for_parking': data.get('paid_for_parking', False),
-        'paid_not_displayed': data.get('paid_not_displayed', False),
-        'first_violation': data.get('first_violation', False),
-        'time_incorrect': data.get('time_incorrect', False),
-        'has_disability_placard': data.get('has_disability_placard', False),
-        'incorrect_vehicle_info': data.get('incorrect_vehicle_info', False),
-    }
+    try:
+        citation_details = _parse_body(_ANALYZE_FIELDS)
+    except RequestValidationError as e:
+        return _bad_request(e)
+
+    if not any(map(citation_details.get, _ANALYZE_FLAGS)):
+        return Response(_DEFAULT_ANALYSIS_BODY, mimetype='application/json')
 
     # Analyze situation
     suggested_angles = AppealStrategyAnalyzer.analyze_situation(citation_details)
 
     # Get details for each angle
-    angle_details = []
-    for angle_key in suggested_angles:
-        angle = AppealStrategyAnalyzer.get_angle(angle_key)
-        if angle:
-            angle_details.append({
-                'key': angle_key,
-                'name': angle.name,
-                'description': angle.description,
-                'questions': angle.key_questions[:3]
-            })
+    angle_details = [
+        _ANGLE_DETAILS[angle_key] for angle_key in suggested_angles
+        if angle_key in _ANGLE_DETAILS
+    ]
 
     return jsonify({
         'success': True,
@@ -102,90 +466,159 @@ def analyze_citation():
     })
 
 
+def _appeal_request(body: Dict) -> Tuple[Dict, Dict, Sequence[str], Dict]:
+    """
+    Turn a validated generate-appeal request body into generator arguments.
+
+    Returns:
+        (citation_details, location_info, selected_angles, evidence)
+    """
+    citation_details = {name: body[name] for name in _CITATION_FIELDS}
+
+    # Get jurisdiction info
+    location_info = RegulationDatabase.get_combined_info(body['city'], body['state'])
+
+    # Get selected angles or analyze
+    selected_angles = body['selected_angles']
+    if not selected_angles:
+        selected_angles = AppealStrategyAnalyzer.analyze_situation(citation_details)
+
+    # Build evidence dict
+    evidence = {
+        _EVIDENCE_KEY.get(item) or f'has_{item.lower().replace(" ", "_")}': True
+        for item in body['evidence']
+    }
+
+    # Add evidence descriptions
+    if body['evidence_description']:
+        evidence['general_description'] = body['evidence_description']
+
+    return (
+        citation_details,
+        {'state': location_info.get('state'), 'city': location_info.get('city')},
+        selected_angles,
+        evidence,
+    )
+
+
+def _angle_names(selected_angles: Sequence[str]) -> List[str]:
+    """Names of the known angles among the selected angle keys."""
+    all_angles = AppealStrategyAnalyzer.get_all_angles()
+    return [angle.name for angle in map(all_angles.get, selected_angles) if angle]
+
+
+def _sse(data, event: Optional[str] = None) -> str:
+    """Format data as one Server-Sent Events message."""
+    message = f"data: {app.json.dumps(data)}\n\n"
+    return f"event: {event}\n{message}" if event else message
+
+
+def _generate_appeal_response(generator: AppealGenerator, body: Dict) -> str:
+    """Build the /api/generate-appeal JSON body, from the appeal cache when possible."""
+    citation_details, location_info, selected_angles, evidence = _appeal_request(body)
+    include_analysis = body['include_analysis']
+
+    cache_key = _appeal_cache_key(
+        citation_details, location_info, sorted(selected_angles), evidence, include_analysis
+    )
+    cached = _appeal_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Generate the comprehensive appeal and, if requested, the AI analysis
+    # (both from a single API request)
+    result = generator.generate_appeal_and_analysis(
+        citation_details,
+        location_info,
+        selected_angles,
+        evidence,
+        include_analysis=include_analysis,
+    )
+    appeal_text = result['appeal']
+
+    analysis_text = None
+    analysis = result['analysis']
+    if analysis and analysis.get('success'):
+        analysis_text = analysis['analysis']
+
+    response_body = app.json.dumps({
+        'success': True,
+        'appeal': appeal_text,
+        'analysis': analysis_text,
+        'angles_used': _angle_names(selected_angles)
+    })
+    # Failed generations come back as error text; don't keep those around
+    failed = (analysis is not None and not analysis.get('success')) or \
+        appeal_text.startswith("Error generating")
+    if not failed:
+        _appeal_cache_set(cache_key, response_body)
+    return response_body
+
+
 @app.route('/api/generate-appeal', methods=['POST'])
 def generate_appeal():
     """Generate parking citation appeal."""
     try:
-        data = request.json
-
-        # Check for API key
-        api_key = os.getenv('GOOGLE_GENERATIVE_AI_API_KEY')
-        if not api_key:
-            return jsonify({
-                'success': False,
-                'error': 'API key not configured'
-            }), 400
-
-        # Create generator
-        generator = AppealGenerator(api_key=api_key)
-
-        # Build citation details
-        citation_details = {
-            'citation_number': data.get('citation_number'),
-            'citation_date': data.get('citation_date'),
-            'citation_time': data.get('citation_time'),
-            'location': data.get('location'),
-            'violation_type': data.get('violation_type'),
-            'fine_amount': data.get('fine_amount'),
-            'first_violation': data.get('first_violation', False),
-            'unclear_signage': data.get('unclear_signage', False),
-            'meter_malfunction': data.get('meter_malfunction', False),
-            'emergency_situation': data.get('emergency_situation', False),
-            'emergency_description': data.get('emergency_description'),
-            'paid_for_parking': data.get('paid_for_parking', False),
-            'paid_not_displayed': data.get('paid_not_displayed', False),
-            'time_incorrect': data.get('time_incorrect', False),
-            'has_disability_placard': data.get('has_disability_placard', False),
-            'additional_info': data.get('additional_info'),
-        }
-
-        # Get jurisdiction info
-        state = data.get('state')
-        city = data.get('city')
-        location_info = RegulationDatabase.get_combined_info(city, state)
-
-        # Get selected angles or analyze
-        selected_angles = data.get('selected_angles')
-        if not selected_angles:
-            selected_angles = AppealStrategyAnalyzer.analyze_situation(citation_details)
-
-        # Build evidence dict
-        evidence = {}
-        evidence_items = data.get('evidence', [])
-        for item in evidence_items:
-            evidence[f'has_{item.lower().replace(" ", "_")}'] = True
-
-        # Add evidence descriptions
-        if data.get('evidence_description'):
-            evidence['general_description'] = data.get('evidence_description')
-
-        # Generate comprehensive appeal
-        appeal_text = generator.generate_comprehensive_appeal(
-            citation_details,
-            {'state': location_info.get('state'), 'city': location_info.get('city')},
-            selected_angles,
-            evidence
+        body = _parse_body(_APPEAL_FIELDS)
+    except RequestValidationError as e:
+        return _bad_request(e)
+
+    try:
+        generator = get_generator(API_KEY)
+        return Response(
+            _generate_appeal_response(generator, body), mimetype='application/json'
         )
 
-        # Get AI analysis if requested
-        analysis_text = None
-        if data.get('include_analysis', True):
-            analysis = generator.analyze_citation_strength(
-                citation_details,
-                location_info,
-                evidence
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/generate-appeals-batch', methods=['POST'])
+def generate_appeals_batch():
+    """
+    Generate appeals for several citations in one request.
+
+    Takes {"citations": [...]}, each entry shaped like a /api/generate-appeal
+    body, and returns one {"appeal", "angles_used"} result per citation, in
+    order. The letters are generated concurrently; no analysis is included.
+    """
+    try:
+        citations = _parse_body(_BATCH_FIELDS)['citations']
+        if len(citations) > MAX_BATCH_SIZE:
+            raise RequestValidationError(
+                f"At most {MAX_BATCH_SIZE} citations can be sent in one batch"
             )
-            if analysis.get('success'):
-                analysis_text = analysis['analysis']
+        bodies = [
+            _validate(citation, _APPEAL_FIELDS, f"citations[{index}]")
+            for index, citation in enumerate(citations)
+        ]
+    except RequestValidationError as e:
+        return _bad_request(e)
+
+    try:
+        cases = []
+        for body in bodies:
+            citation_details, location_info, selected_angles, evidence = _appeal_request(body)
+            cases.append({
+                'citation_details': citation_details,
+                'location_info': location_info,
+                'selected_angles': selected_angles,
+                'evidence': evidence,
+            })
+
+        appeals = get_generator(API_KEY).generate_batch(cases)
 
         return jsonify({
             'success': True,
-            'appeal': appeal_text,
-            'analysis': analysis_text,
-            'angles_used': [
-                AppealStrategyAnalyzer.get_angle(key).name
-                for key in selected_angles
-                if AppealStrategyAnalyzer.get_angle(key)
+            'results': [
+                {
+                    'appeal': appeal,
+                    'angles_used': _angle_names(case['selected_angles'])
+                }
+                for case, appeal in zip(cases, appeals)
             ]
         })
 
@@ -196,22 +629,130 @@ def generate_appeal():
         }), 500
 
 
+@app.route('/api/generate-appeal/async', methods=['POST'])
+def submit_appeal():
+    """
+    Start generating an appeal in the background and return its task id at once.
+
+    Poll /api/appeal-status/<task_id> for the result, which has the same shape
+    as the /api/generate-appeal response.
+    """
+    try:
+        body = _parse_body(_APPEAL_FIELDS)
+    except RequestValidationError as e:
+        return _bad_request(e)
+
+    slots = _task_slots
+    if not slots.acquire(blocking=False):
+        response = jsonify({
+            'success': False,
+            'error': 'Too many appeals in progress; try again shortly'
+        })
+        response.headers['Retry-After'] = '30'
+        return response, 503
+
+    task_id = uuid.uuid4().hex
+    try:
+        future = _task_pool.submit(_generate_appeal_response, get_generator(API_KEY), body)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    _appeal_tasks.setex(task_id, APPEAL_TASK_TTL, future)
+
+    return jsonify({
+        'success': True,
+        'task_id': task_id,
+        'status_url': url_for('appeal_status', task_id=task_id),
+    }), 202
+
+
+@app.route('/api/appeal-status/<task_id>')
+def appeal_status(task_id):
+    """Get the status of a background appeal, and its result once finished."""
+    future = _appeal_tasks.get(task_id)
+    if future is None:
+        return jsonify({
+            'success': False,
+            'error': 'Unknown or expired task'
+        }), 404
+
+    if not future.done():
+        return jsonify({'success': True, 'status': 'pending'})
+
+    error = future.exception()
+    if error is not None:
+        return jsonify({
+            'success': False,
+            'status': 'error',
+            'error': str(error)
+        })
+
+    return jsonify({
+        'success': True,
+        'status': 'done',
+        'result': app.json.loads(future.result()),
+    })
+
+
+@app.route('/api/generate-appeal/stream', methods=['POST'])
+def stream_appeal():
+    """
+    Stream the comprehensive appeal as Server-Sent Events while it is written.
+
+    Each piece of the letter arrives as a {"chunk": ...} message, followed by a
+    final "done" event carrying angles_used. No analysis is included.
+    """
+    try:
+        body = _parse_body(_APPEAL_FIELDS)
+    except RequestValidationError as e:
+        return _bad_request(e)
+
+    try:
+        citation_details, location_info, selected_angles, evidence = _appeal_request(body)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+    generator = get_generator(API_KEY)
+
+    def events():
+        for chunk in generator.stream_comprehensive_appeal(
+            citation_details, location_info, selected_angles, evidence
+        ):
+            yield _sse({'chunk': chunk})
+        yield _sse({'angles_used': _angle_names(selected_angles)}, event='done')
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        # Stop proxies from buffering the stream or caching it
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
 @app.route('/form')
 def appeal_form():
     """Appeal form page."""
-    return render_template('form.html')
+    return _page('form.html')
 
 
 @app.route('/about')
 def about():
     """About page."""
-    return render_template('about.html')
+    return _page('about.html')
 
 
 if __name__ == '__main__':
     # Check for API key
-    if not os.getenv('GOOGLE_GENERATIVE_AI_API_KEY'):
+    if not API_KEY:
         print("WARNING: GOOGLE_GENERATIVE_AI_API_KEY not set!")
-        print("The app will run but appeal generation will fail.")
+        print("The app will run but appeal generation will return 503.")
 
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Development server only; see README.md for running under gunicorn.
+    # Debug mode (reloader and interactive debugger) is opt-in via FLASK_DEV=1.
+    # Parsed explicitly so FLASK_DEV=0 or false can't expose the debugger.
+    debug = os.getenv('FLASK_DEV', '').lower() in ('1', 'true', 'yes')
+    app.run(debug=debug, threaded=True, host='0.0.0.0', port=5000)